@@ -0,0 +1,43 @@
+"""Time to generate order books with *generate_orders* and *random_orders*.
+
+*generate_orders* is timed up to 10^5 orders, *random_orders* up to 10^7.
+
+Run from repo root:
+
+    python benchmarks/bench_generate.py
+"""
+
+import random
+from time import perf_counter
+
+from aloh import Price, Volume, generate_orders
+from aloh.generate import random_orders
+
+N_DAYS = 365
+PRICER = Price(mean=100, delta=10)
+SIZER = Volume(min_order=20, max_order=150, round_to=5)
+MEAN_ORDER = 85
+
+
+def timed(f, n):
+    start = perf_counter()
+    orders = f(N_DAYS, n * MEAN_ORDER, PRICER, SIZER)
+    return len(orders), perf_counter() - start
+
+
+def main():
+    random.seed(0)
+    print(f"{'function':>16} {'orders':>10} {'sec':>8}")
+    for n in [10**3, 10**4, 10**5]:
+        print(
+            "{:>16} {:>10} {:>8.3f}".format(
+                "generate_orders", *timed(generate_orders, n)
+            )
+        )
+    for n in [10**5, 10**6, 10**7]:
+        f = lambda *args: random_orders(*args, seed=0)
+        print("{:>16} {:>10} {:>8.3f}".format("random_orders", *timed(f, n)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Import time of aloh entry points, measured with ``python -X importtime``.
+
+Each statement runs in a fresh interpreter. Time is the sum of cumulative
+times of top level imports made by the statement (site imports excluded),
+median of *REPEAT* runs, with the heavy modules that were loaded.
+
+Run from repo root:
+
+    python benchmarks/bench_import.py
+"""
+
+import statistics
+import subprocess
+import sys
+
+REPEAT = 5
+HEAVY = ["numpy", "pandas", "pulp", "scipy"]
+STATEMENTS = [
+    "import aloh",
+    "from aloh import Product",
+    "from aloh import generate_orders",
+    "from aloh import OptModel",
+    "from aloh import Product, OptModel, DataframeViewer",
+]
+
+
+def import_time(statement: str):
+    """Milliseconds and heavy modules loaded by *statement*."""
+    check = f"import sys; print([m for m in {HEAVY} if m in sys.modules])"
+    baseline = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "pass"],
+        capture_output=True,
+        text=True,
+    ).stderr
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"{statement}\n{check}"],
+        capture_output=True,
+        text=True,
+    )
+    site = {line.split("|")[-1] for line in baseline.splitlines()}
+    us = 0
+    for line in res.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # top level imports only, nested ones are in their cumulative time
+        if not name.startswith("  ") and name not in site:
+            us += int(cumulative)
+    return us / 1000, res.stdout.strip()
+
+
+def main():
+    print(f"{'statement':<64} {'ms':>8}  modules")
+    for statement in STATEMENTS:
+        runs = [import_time(statement) for _ in range(REPEAT)]
+        ms = statistics.median(t for t, _ in runs)
+        print(f"{statement:<64} {ms:>8.1f}  {runs[0][1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Compare cold build-and-solve with incremental warm start re-solve
+after a few order changes.
+
+Run from repo root:
+
+    python benchmarks/bench_incremental.py
+"""
+
+import random
+from copy import deepcopy
+from time import perf_counter
+
+from aloh import OptModel
+from aloh.incremental import IncrementalModel
+from books import make_products
+
+
+def cold(products):
+    """Build and solve a new model, return model, build and solve time."""
+    start = perf_counter()
+    m = OptModel(products, "cold", inventory_weight=0.1)
+    m.use_solver(msg=False)
+    m.build()
+    t_build = perf_counter() - start
+    m.solve()
+    return m, t_build, m.time_elapsed
+
+
+def change(products, m, n_changes: int):
+    """Apply the same random changes to *products* and incremental model *m*."""
+    for _ in range(n_changes):
+        p = random.choice(products)
+        day = random.choice(m.days)
+        volume = random.choice(p.orders)["volume"]
+        price = random.choice(p.orders)["price"]
+        p.add_order(day, volume, price)
+        m.add_order(p.name, day, volume, price)
+        i = random.randrange(len(p.orders) - 1)
+        price = round(p.orders[i]["price"] * random.uniform(0.9, 1.1), 1)
+        p.orders[i]["price"] = price
+        m.reprice_order(p.name, i, price)
+
+
+def main(n_products=4, n_days=30, n_changes=3, n_rounds=5):
+    random.seed(0)
+    products = make_products(n_products, n_days)
+    m = IncrementalModel(deepcopy(products), "warm", inventory_weight=0.1)
+    m.use_solver(msg=False)
+    m.evaluate()
+    print("round  cold build  cold solve  edit, sec  warm solve  objective diff")
+    for k in range(n_rounds):
+        start = perf_counter()
+        change(products, m, n_changes)
+        t_edit = perf_counter() - start
+        m_cold, t_build, t_solve = cold(products)
+        m.evaluate()
+        diff = m.model.objective.value() - m_cold.model.objective.value()
+        print(
+            f"{k:5}  {t_build:10.3f}  {t_solve:10.3f}  {t_edit:9.4f}  "
+            f"{m.time_elapsed:10.3f}  {diff:14.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Compare model build time for stock balance and cumulative inventory.
+
+Run from repo root:
+
+    python benchmarks/bench_inventory.py
+"""
+import random
+from time import perf_counter
+
+from aloh import OptModel
+from books import make_products
+
+
+def n_terms(om: OptModel) -> int:
+    return sum(len(c) for c in om.model.constraints.values())
+
+
+def build(products, inventory: str):
+    start = perf_counter()
+    om = OptModel(products, "bench", inventory_weight=0.1, inventory=inventory)
+    om.build()
+    return om, perf_counter() - start
+
+
+def main(n_products=4, days=(30, 90, 180, 365)):
+    print("days  formulation   build, sec  constraint terms")
+    for n_days in days:
+        random.seed(n_days)
+        products = make_products(n_products, n_days)
+        for inventory in ["cumulative", "balance"]:
+            om, t = build(products, inventory)
+            print(f"{n_days:4}  {inventory:12} {t:10.3f}  {n_terms(om):16}")
+
+
+if __name__ == "__main__":
+    main()
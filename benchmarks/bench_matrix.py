@@ -0,0 +1,45 @@
+"""Compare model build time for PuLP and matrix form models.
+
+Run from repo root:
+
+    python benchmarks/bench_matrix.py
+"""
+
+import random
+from time import perf_counter
+
+from aloh import OptModel
+from aloh.matrix import MatrixModel
+from books import make_products
+
+
+def build_pulp(products):
+    om = OptModel(products, "bench", inventory_weight=0.1)
+    om.build()
+    return om
+
+
+def build_matrix(products):
+    mm = MatrixModel(products, inventory_weight=0.1)
+    mm.build()
+    return mm
+
+
+def timed(f, *args):
+    start = perf_counter()
+    res = f(*args)
+    return res, perf_counter() - start
+
+
+def main(n_products=4, days=(30, 90, 180, 365)):
+    print("days  orders  pulp build, sec  matrix build, sec")
+    for n_days in days:
+        random.seed(n_days)
+        products = make_products(n_products, n_days)
+        _, t1 = timed(build_pulp, products)
+        mm, t2 = timed(build_matrix, products)
+        print(f"{n_days:4}  {mm.n_orders:6}  {t1:15.3f}  {t2:17.4f}")
+
+
+if __name__ == "__main__":
+    main()
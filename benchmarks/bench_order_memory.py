@@ -0,0 +1,95 @@
+"""Memory of a 1M-order book in different order representations.
+
+- dicts: *Product.orders* as list of dicts, as filled by *add_order*
+  before the array store
+- dataclasses: list of *Order* dataclasses with per-instance __dict__,
+  as made by *order_dict* before the array store
+- slotted dataclasses: list of *Order* objects with __slots__
+- Orders, append: *Orders* filled by *add_order* one order at a time
+- Orders, bulk: *Orders* created from arrays at once
+
+Memory is measured with tracemalloc as allocated size of the structure.
+
+Run from repo root:
+
+    python benchmarks/bench_order_memory.py
+"""
+
+import random
+import tracemalloc
+from dataclasses import dataclass
+
+from aloh.orders import Order, Orders
+
+
+@dataclass
+class DictOrder:
+    day: int
+    volume: float
+    price: float
+
+
+def book(n: int):
+    random.seed(0)
+    return (
+        [random.randrange(60) for _ in range(n)],
+        [round(random.uniform(1, 100), 1) for _ in range(n)],
+        [round(random.uniform(0.1, 1), 2) for _ in range(n)],
+    )
+
+
+def as_dicts(days, volumes, prices):
+    return [dict(day=d, volume=v, price=p) for d, v, p in zip(days, volumes, prices)]
+
+
+def as_dataclasses(days, volumes, prices):
+    return [DictOrder(d, v, p) for d, v, p in zip(days, volumes, prices)]
+
+
+def as_slotted(days, volumes, prices):
+    return [Order(d, v, p) for d, v, p in zip(days, volumes, prices)]
+
+
+def as_appended(days, volumes, prices):
+    orders = Orders()
+    for d, v, p in zip(days, volumes, prices):
+        orders.append(d, v, p)
+    return orders
+
+
+def as_bulk(days, volumes, prices):
+    return Orders(days, volumes, prices)
+
+
+def allocated(f, *args) -> int:
+    """Bytes allocated by *f* and still held by its result."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    res = f(*args)
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del res
+    return size
+
+
+def main(n=1_000_000):
+    columns = book(n)
+    # lists share number objects with *columns*, those are not counted,
+    # so sizes of lists are lower bounds
+    cases = [
+        ("dicts", as_dicts),
+        ("dataclasses", as_dataclasses),
+        ("slotted dataclasses", as_slotted),
+        ("Orders, append", as_appended),
+        ("Orders, bulk", as_bulk),
+    ]
+    sizes = [(name, allocated(f, *columns)) for name, f in cases]
+    base = sizes[0][1]
+    print(f"{n} orders")
+    print("representation         MB  vs dicts")
+    for name, size in sizes:
+        print(f"{name:20} {size / 2 ** 20:6.1f}  {size / base:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Compare dense and sparse full requirement calculation.
+
+The dense path builds B as a DataFrame cell by cell and inverts I - B,
+as Materials did before the adjacency list backend. The sparse path
+uses topological order propagation on the adjacency list.
+
+Run from repo root:
+
+    python benchmarks/bench_requirements.py
+"""
+
+import random
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from aloh.requirements import Materials, calculate_full_requirement
+
+
+def random_bom(n_products: int, inputs_per_product: int = 2):
+    """Acyclic bill of materials: each product requires a few products with higher index."""
+    names = [f"P{i}" for i in range(n_products)]
+    edges = []
+    for i in range(n_products - 1):
+        for j in random.sample(
+            range(i + 1, n_products), min(inputs_per_product, n_products - i - 1)
+        ):
+            edges.append((names[i], round(random.uniform(0.1, 1), 2), names[j]))
+    return names, edges
+
+
+def dense(names, edges):
+    B = pd.DataFrame(0.0, columns=names, index=names)
+    for p_i, x, p_j in edges:
+        B.loc[p_i, p_j] = x
+    return calculate_full_requirement(B.to_numpy())
+
+
+def sparse(names, edges):
+    ms = Materials(names)
+    for p_i, x, p_j in edges:
+        ms.require(p_i, x, p_j)
+    return ms.calculate_R()
+
+
+def timed(f, *args):
+    start = perf_counter()
+    res = f(*args)
+    return res, perf_counter() - start
+
+
+def main(sizes=(10, 30, 100, 300, 1000)):
+    random.seed(0)
+    print("products  dense, sec  sparse, sec  max abs diff")
+    for n in sizes:
+        names, edges = random_bom(n)
+        r1, t1 = timed(dense, names, edges)
+        r2, t2 = timed(sparse, names, edges)
+        print(f"{n:8}  {t1:10.4f}  {t2:11.4f}  {np.abs(r1 - r2).max():12.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Compare rolling horizon and full horizon models.
+
+The full horizon model is solved with a time limit, its objective is
+the best solution found within that limit.
+
+Run from repo root:
+
+    python benchmarks/bench_rolling.py [n_products] [time_limit]
+"""
+
+import random
+import sys
+from time import perf_counter
+
+from aloh import OptModel
+from aloh.rolling import RollingHorizon
+from books import make_products
+
+
+def full(products, time_limit):
+    start = perf_counter()
+    m = OptModel(products, "full", inventory_weight=0.1)
+    m.use_solver(msg=False, time_limit=time_limit)
+    m.evaluate()
+    return m.solve_info["objective"], m.solve_info["status"], perf_counter() - start
+
+
+def rolling(products, window, step, time_limit):
+    r = RollingHorizon(products, "rolling", 0.1, window=window, step=step)
+    r.solver.time_limit = time_limit
+    r.evaluate()
+    return r.objective_value(), r.time_elapsed
+
+
+def main(n_products=4, time_limit=60, days=(90, 365), windows=((14, 7), (28, 7))):
+    print("days  model            objective   time, sec")
+    for n_days in days:
+        random.seed(n_days)
+        products = make_products(n_products, n_days)
+        for p in products:
+            p.storage_days = 7
+        obj, status, t = full(products, time_limit)
+        print(f"{n_days:4}  full ({status:8})  {obj:10.0f}  {t:9.2f}")
+        for window, step in windows:
+            obj, t = rolling(products, window, step, time_limit)
+            label = f"rolling {window}/{step}"
+            print(f"{n_days:4}  {label:15}  {obj:10.0f}  {t:9.2f}")
+
+
+if __name__ == "__main__":
+    main(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,49 @@
+"""Synthetic order books for benchmarks."""
+
+from typing import List
+
+from aloh import Price, Product, Volume, generate_orders
+from aloh.generate import random_book
+
+
+def make_product(
+    name: str, n_days: int, capacity: float = 100, oversubscription: float = 1.2
+) -> Product:
+    """Product with orders worth *oversubscription* times its capacity."""
+    p = Product(name, capacity=capacity, unit_cost=0.5 * capacity)
+    p.orders = generate_orders(
+        n_days=n_days,
+        total_volume=oversubscription * capacity * n_days,
+        pricer=Price(mean=capacity, delta=0.1 * capacity),
+        sizer=Volume(min_order=0.2 * capacity, max_order=1.5 * capacity, round_to=5),
+    )
+    return p
+
+
+def make_products(n_products: int, n_days: int, **kwargs) -> List[Product]:
+    return [make_product(f"P{i}", n_days, **kwargs) for i in range(n_products)]
+
+
+def make_book(
+    n_products: int,
+    n_days: int,
+    n_orders: int,
+    capacity: float = 100,
+    oversubscription: float = 1.2,
+    seed: int = 0,
+) -> List[Product]:
+    """Products with about *n_orders* orders in total, same for same *seed*."""
+    n = max(1, n_orders // n_products)
+    mean_order = oversubscription * capacity * n_days / n
+    products = [
+        Product(f"P{i}", capacity=capacity, unit_cost=0.5 * capacity)
+        for i in range(n_products)
+    ]
+    return random_book(
+        products,
+        n_days,
+        pricer=Price(mean=capacity, delta=0.1 * capacity),
+        sizer=Volume(min_order=0.5 * mean_order, max_order=1.5 * mean_order),
+        oversubscription=oversubscription,
+        seed=seed,
+    )
@@ -0,0 +1,143 @@
+"""Benchmark suite for OptModel scaling in products, days and orders.
+
+For each case of the grid the suite synthesises an order book with
+*random_book*, then times model build, solve and
+*DataframeViewer.summary_dataframe* separately. Peak Python memory of
+build and summary is measured with tracemalloc in a separate run, so it
+does not slow down the timed run. Solver memory is not included, as
+the solver runs in a separate process.
+
+Results are written as JSON, one record per case. Pass a previous
+results file with --compare to see time ratios run to run.
+
+Run from repo root:
+
+    python benchmarks/suite.py --grid quick --out results.json
+    python benchmarks/suite.py --grid quick --compare results.json
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import sys
+import tracemalloc
+from datetime import datetime
+from time import perf_counter
+
+import pulp
+
+from aloh import DataframeViewer, OptModel
+from books import make_book
+
+GRIDS = {
+    "quick": dict(products=[1, 4], days=[7, 30], orders=[10, 100]),
+    "default": dict(products=[1, 4, 10], days=[7, 30, 90], orders=[10, 100, 1000]),
+    "full": dict(
+        products=[1, 4, 10, 50],
+        days=[7, 30, 90, 365],
+        orders=[10, 100, 1000, 10000],
+    ),
+}
+
+
+def cases(grid):
+    for n_products, n_days, n_orders in itertools.product(
+        grid["products"], grid["days"], grid["orders"]
+    ):
+        if n_orders >= n_products:
+            yield n_products, n_days, n_orders
+
+
+def build(products):
+    m = OptModel(products, "bench", inventory_weight=0.1)
+    m.build()
+    return m
+
+
+def run_case(n_products, n_days, n_orders, time_limit, seed=0):
+    products = make_book(n_products, n_days, n_orders, seed=seed)
+    res = dict(
+        products=n_products,
+        days=n_days,
+        orders=sum(len(p.orders) for p in products),
+    )
+    start = perf_counter()
+    m = build(products)
+    res["build"] = perf_counter() - start
+    m.use_solver(msg=False, time_limit=time_limit)
+    m.use_logging = True
+    m.solve()
+    res["solve"] = m.time_elapsed
+    res["status"] = m.solve_info["status"]
+    start = perf_counter()
+    DataframeViewer(m).summary_dataframe()
+    res["summary"] = perf_counter() - start
+    res["variables"] = m.model.numVariables()
+    res["constraints"] = m.model.numConstraints()
+    # peak memory of build and summary, values of solved model are reused
+    tracemalloc.start()
+    m2 = build(products)
+    for v1, v2 in zip(m.model.variables(), m2.model.variables()):
+        v2.varValue = v1.varValue
+    DataframeViewer(m2).summary_dataframe()
+    res["peak_memory_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return res
+
+
+def compare(results, baseline):
+    key = lambda r: (r["products"], r["days"], r["orders"])
+    old = {key(r): r for r in baseline["results"]}
+    print("\nRatio to baseline (new / old):")
+    print("products  days  orders  build  solve  summary  memory")
+    for r in results:
+        b = old.get(key(r))
+        if b is None:
+            continue
+        ratios = [
+            r[k] / b[k] if b[k] else float("nan")
+            for k in ["build", "solve", "summary", "peak_memory_mb"]
+        ]
+        print(
+            f"{r['products']:8}  {r['days']:4}  {r['orders']:6}  "
+            + "  ".join(f"{x:5.2f}" for x in ratios)
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--grid", choices=list(GRIDS), default="quick")
+    parser.add_argument("--time-limit", type=float, default=10)
+    parser.add_argument("--out", help="write results to JSON file")
+    parser.add_argument("--compare", help="previous results JSON file")
+    args = parser.parse_args(argv)
+
+    results = []
+    print("products  days  orders   build   solve  summary  memory, MB")
+    for case in cases(GRIDS[args.grid]):
+        r = run_case(*case, time_limit=args.time_limit)
+        results.append(r)
+        print(
+            f"{r['products']:8}  {r['days']:4}  {r['orders']:6}  "
+            f"{r['build']:6.3f}  {r['solve']:6.3f}  {r['summary']:7.3f}  "
+            f"{r['peak_memory_mb']:10.1f}"
+        )
+    doc = dict(
+        created=datetime.now().isoformat(timespec="seconds"),
+        grid=args.grid,
+        time_limit=args.time_limit,
+        python=platform.python_version(),
+        pulp=pulp.__version__,
+        results=results,
+    )
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(doc, f, indent=1)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,6 +10,7 @@ setup(
     author_email="e.pogrebnyak@gmail.com",
     package_dir={'': 'src'},
     packages=['aloh'],
-    install_requires=["numpy==1.19.3", "pandas==1.1.4", "PuLP==2.3.1"],
-    python_requires=">=3.6",
+    install_requires=["numpy==1.19.3", "pandas==1.1.4", "PuLP==2.8.0"],
+    extras_require={"matrix": ["scipy>=1.9"], "highs": ["highspy"]},
+    python_requires=">=3.7",
 )
@@ -1,12 +1,39 @@
 """Select orders and plan discrete daily production for several products.
 
-Use *Product* class to formulate input information and *OptModel* to solve 
-linear programming model. 
+Use *Product* class to formulate input information and *OptModel* to solve
+linear programming model.
 
 *DataframeViewer* shows modelling results as pandas dataframes.
 
 *generate_orders*, *Price*, *Volume* are used for order simulation.
+
+Names are imported on first use, so that ``import aloh`` does not load
+pandas or PuLP: PuLP is loaded with *OptModel*, pandas when dataframes
+are made.
 """
-from .generate import Price, Volume, generate_orders
-from .interface import Product
-from .small import DataframeViewer, OptModel
+import importlib
+
+# name: module
+_LAZY = {
+    "Price": "generate",
+    "Volume": "generate",
+    "generate_orders": "generate",
+    "Product": "interface",
+    "DataframeViewer": "small",
+    "OptModel": "small",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,145 @@
+"""Build and solve models from asyncio code without blocking the event loop.
+
+Model build, MPS export and solution reading run in an executor (default
+thread pool of the loop), CBC runs as an asyncio subprocess:
+
+    ac, xs = await aevaluate(products, "model", inventory_weight=0.1, timeout=600)
+
+    m = OptModel(products, "model", inventory_weight=0.1)
+    task = asyncio.create_task(aevaluate_model(m, on_line=print))
+    ...
+    task.cancel()  # kills the solver process
+
+Cancelling the task or a wall clock *timeout* kills the solver process
+group. Each solve writes its files to a new temporary directory and uses
+own *OptModel*, so several solves can run concurrently in one process.
+Only CBC is supported, as in *aloh.external*.
+"""
+
+import asyncio
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import Executor
+from functools import partial
+from time import perf_counter
+from typing import Callable, List, Optional
+
+from aloh.external import ExternalSolve
+from aloh.interface import Product
+from aloh.small import OptModel
+from aloh.solvers import SolverSettings
+
+__all__ = ["AsyncSolve", "aevaluate", "aevaluate_model"]
+
+
+class AsyncSolve(ExternalSolve):
+    """*ExternalSolve* with the solver as an asyncio subprocess."""
+
+    def __init__(self, *args, executor: Optional[Executor] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.executor = executor
+
+    async def arun(self) -> int:
+        """Solve and set variable values of the model, returns PuLP status.
+        Raises *SolveStopped* on timeout, kills the solver if cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        tmp = tempfile.mkdtemp(prefix="aloh_", dir=self.workdir)
+        try:
+            mps_path, sol_path = self.paths(tmp)
+            names = await loop.run_in_executor(self.executor, self.write, mps_path)
+            await self._astart(self.command(mps_path, sol_path))
+            try:
+                await asyncio.wait_for(self._await(), self.timeout)
+            except asyncio.TimeoutError:
+                self._kill(f"timed out after {self.timeout} sec")
+                await self._areap()
+            except asyncio.CancelledError:
+                self._kill("cancelled")
+                await self._areap()
+                raise
+            return await loop.run_in_executor(
+                self.executor, self.read_solution, sol_path, names
+            )
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    async def _astart(self, args):
+        with self._lock:
+            if self.stopped:
+                return
+        self.process = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+    async def _await(self):
+        if self.process is None:
+            return
+        async for line in self.process.stdout:
+            line = line.decode(errors="replace").rstrip("\r\n")
+            if self.solver.msg:
+                print(line)
+            if self.on_line:
+                self.on_line(line)
+        await self.process.wait()
+
+    async def _areap(self):
+        if self.process is not None:
+            # not cancellable, so that no zombie process is left
+            await asyncio.shield(self.process.wait())
+
+    def _finished(self) -> bool:
+        return self.process is not None and self.process.returncode is not None
+
+
+async def aevaluate_model(
+    m: OptModel,
+    on_line: Optional[Callable[[str], None]] = None,
+    timeout: Optional[float] = None,
+    workdir: Optional[str] = None,
+    executor: Optional[Executor] = None,
+):
+    """Same as *m.evaluate()*, but awaitable, see *ExternalSolve* for
+    *on_line*, *timeout* and *workdir*. Running solve is also stopped
+    by *m.cancel()*.
+    """
+    loop = asyncio.get_running_loop()
+    key, hit = await loop.run_in_executor(executor, m.from_cache)
+    if hit:
+        return m.accepted_orders(), m.estimated_production()
+    await loop.run_in_executor(executor, m.build)
+    m.loaded = None
+    m.job = AsyncSolve(m.model, m.solver, on_line, timeout, workdir, executor=executor)
+    with m.timer.phase("solver") as ph:
+        start = perf_counter()
+        await m.job.arun()
+        m.time_elapsed = perf_counter() - start
+        ph.count = m.model.numVariables()
+    m.set_solve_info()
+    return await loop.run_in_executor(executor, m.extract_result, key)
+
+
+async def aevaluate(
+    products: List[Product],
+    model_name: str,
+    inventory_weight: float,
+    solver: Optional[SolverSettings] = None,
+    on_line: Optional[Callable[[str], None]] = None,
+    timeout: Optional[float] = None,
+    workdir: Optional[str] = None,
+    executor: Optional[Executor] = None,
+):
+    """Create *OptModel* for *products* and solve it with *aevaluate_model*.
+    Returns accepted orders and production as *OptModel.evaluate*.
+    """
+    loop = asyncio.get_running_loop()
+    make = partial(OptModel, products, model_name, inventory_weight)
+    m = await loop.run_in_executor(executor, make)
+    if solver is not None:
+        m.solver = solver
+    return await aevaluate_model(m, on_line, timeout, workdir, executor)
@@ -0,0 +1,145 @@
+"""Cache of solve results keyed by model fingerprint.
+
+The fingerprint is a SHA-256 hash of canonicalised model inputs: products,
+capacities, unit costs, storage days, orders, bill of materials, inventory
+weight, model days, opening inventory, the solver settings that change
+the result (time limit and gap) and orders fixed by prescreening.
+Results are JSON files in a directory, the oldest are evicted when
+the cache exceeds *max_bytes* or are older than *max_age* seconds:
+
+    cache = ResultCache("~/.cache/aloh", max_bytes=100 * 2 ** 20)
+    m = OptModel(products, "model", inventory_weight=0.1).use_cache(cache)
+    ac, xs = m.evaluate()  # solved once, later runs read from disk
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np  # type: ignore
+
+__all__ = ["ResultCache", "model_fingerprint"]
+
+# change when the model formulation changes, so that old results are not used
+FORMULATION_VERSION = 1
+
+
+def model_fingerprint(m) -> str:
+    """SHA-256 of inputs of *OptModel* *m* that define its solution."""
+    header = dict(
+        version=FORMULATION_VERSION,
+        products=m.products,
+        capacities=[_number(m.capacities[p]) for p in m.products],
+        unit_costs=[_number(m.unit_costs[p]) for p in m.products],
+        storage_days=[_number(m.storage_days[p]) for p in m.products],
+        requires={
+            p: [(k, _number(x)) for k, x in sorted(m.ms.requires[p].items())]
+            for p in m.products
+        },
+        inventory_weight=_number(m.inventory_weight),
+        days=len(m.days),
+        opening_inventory=[_number(m.opening_inventory[p]) for p in m.products],
+        time_limit=m.solver.time_limit,
+        gap=m.solver.gap,
+        # orders fixed by prescreening
+        fixed=m.prescreen_report.fixed if m.prescreen_report else None,
+    )
+    h = hashlib.sha256(json.dumps(header, sort_keys=True).encode())
+    for p in m.products:
+        orders = m.order_dict[p]
+        h.update(np.int64(len(orders)).tobytes())
+        h.update(np.ascontiguousarray(orders.day, dtype=np.int32).tobytes())
+        h.update(np.ascontiguousarray(orders.volume, dtype=np.float64).tobytes())
+        h.update(np.ascontiguousarray(orders.price, dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+
+def _number(x):
+    return None if x is None else float(x)
+
+
+def _remove(path: Path):
+    # Path.unlink(missing_ok=True) needs Python 3.8
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class ResultCache:
+    """Results on disk in *directory*, one JSON file per fingerprint.
+
+    - *max_bytes*: total size of cached files, least recently used files
+      are removed above it;
+    - *max_age*: seconds since a result was stored, older results are
+      treated as missing and removed.
+    """
+
+    def __init__(
+        self,
+        directory="~/.cache/aloh",
+        max_bytes: int = 100 * 2**20,
+        max_age: Optional[float] = None,
+    ):
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        path = self.path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if self.max_age is not None and time.time() - entry["created"] > self.max_age:
+            _remove(path)
+            return None
+        # access time for least recently used eviction
+        os.utime(path)
+        return entry["result"]
+
+    def put(self, key: str, result: Dict):
+        entry = dict(created=time.time(), result=result)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, self.path(key))
+        self.evict()
+
+    def evict(self):
+        """Remove expired results and least recently used results above *max_bytes*."""
+        now = time.time()
+        files = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            # mtime is not earlier than creation time
+            if self.max_age is not None and now - stat.st_mtime > self.max_age:
+                _remove(path)
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            _remove(path)
+            total -= size
+
+    def clear(self):
+        for path in self.directory.glob("*.json"):
+            _remove(path)
+
+    def __len__(self):
+        return len(list(self.directory.glob("*.json")))
@@ -0,0 +1,482 @@
+"""Resident planning service on localhost.
+
+The service keeps aloh, pandas, numpy and PuLP imported and solvers
+checked, so a re-plan costs model build and solve time only. Jobs are
+JSON documents (see *read_job*) sent over HTTP:
+
+    POST   /jobs          submit a job, returns job status
+    GET    /jobs          status of all jobs
+    GET    /jobs/<id>     status, timing and, when done, the result;
+                          ?wait=<seconds> waits for the job to finish
+    DELETE /jobs/<id>     cancel a queued or running job
+    GET    /health        service status
+
+Jobs run by *priority* (larger first, then in order of submission),
+at most *max_concurrent* at a time, each CBC solve in a child process.
+A job with the same model fingerprint (see *aloh.cache*) as a queued
+or running job is not solved again, the running job is returned.
+
+Start the service and submit a job:
+
+    python -m aloh.daemon --port 8765 --workers 2
+
+    client = Client("http://127.0.0.1:8765")
+    job = client.submit(job_dict(products, "model", inventory_weight=0.1))
+    result = client.wait(job["id"])["result"]
+"""
+
+import argparse
+import heapq
+import itertools
+import json
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from aloh.cache import ResultCache
+from aloh.external import ExternalSolve
+from aloh.interface import Product
+from aloh.orders import Orders, as_orders
+from aloh.small import OptModel
+from aloh.solvers import SOLVER_NAMES, SolverSettings, available
+
+__all__ = ["Job", "Scheduler", "Client", "read_job", "job_dict", "serve"]
+
+STATUSES = ["queued", "running", "done", "failed", "cancelled"]
+
+
+def read_product(data: Dict) -> Product:
+    """Product from a dict with Product fields. Orders are a list of
+    order dicts or a dict of day, volume and price lists, order days
+    must be non-negative integers. *requires* is a mapping of product
+    names to amounts.
+    """
+    data = dict(data)
+    requires = data.get("requires", {})
+    if not isinstance(requires, dict):
+        raise ValueError(f"Requirements must be a mapping, not {requires!r}")
+    data["requires"] = {str(k): float(v) for k, v in requires.items()}
+    orders = data.pop("orders", [])
+    if isinstance(orders, dict):
+        orders = Orders(orders["day"], orders["volume"], orders["price"])
+    else:
+        orders = as_orders(orders)
+    return Product(orders=orders, **data)
+
+
+def read_job(data: Dict) -> Dict:
+    """Check and convert a job dict:
+
+    - *products*: list of product dicts, see *read_product*;
+    - *model_name*, *inventory_weight*: as for *OptModel*;
+    - *solver*: *SolverSettings* fields, optional, CBC only;
+    - *priority*: larger runs first, default 0;
+    - *timeout*: wall clock seconds for the solver process, optional.
+
+    Raises ValueError for invalid jobs.
+    """
+    try:
+        products = [read_product(p) for p in data["products"]]
+        solver = SolverSettings(**dict(data.get("solver", {}), msg=False))
+        if solver.name != "CBC":
+            raise ValueError(f"Service solves with CBC only, not {solver.name}")
+        return dict(
+            products=products,
+            model_name=str(data.get("model_name", "model")),
+            inventory_weight=float(data["inventory_weight"]),
+            solver=solver,
+            priority=int(data.get("priority", 0)),
+            timeout=None if data.get("timeout") is None else float(data["timeout"]),
+        )
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Invalid job: {e!r}")
+
+
+def job_dict(
+    products: List[Product],
+    model_name: str,
+    inventory_weight: float,
+    solver: Optional[SolverSettings] = None,
+    priority: int = 0,
+    timeout: Optional[float] = None,
+) -> Dict:
+    """Job as a JSON serialisable dict, inverse of *read_job*."""
+    res = dict(
+        products=[product_dict(p) for p in products],
+        model_name=model_name,
+        inventory_weight=inventory_weight,
+        priority=priority,
+        timeout=timeout,
+    )
+    if solver is not None:
+        res["solver"] = solver.as_dict()
+    return res
+
+
+def product_dict(p: Product) -> Dict:
+    day, volume, price = as_orders(p.orders).columns()
+    return dict(
+        name=p.name,
+        capacity=p.capacity,
+        unit_cost=p.unit_cost,
+        storage_days=p.storage_days,
+        requires=dict(p.requires),
+        orders=dict(day=day, volume=volume, price=price),
+    )
+
+
+@dataclass
+class Job:
+    """Model job, its status, timing and result."""
+
+    id: int
+    key: str
+    # released when the job is finished, *phases* keep its timing
+    model: Optional[OptModel]
+    priority: int = 0
+    timeout: Optional[float] = None
+    status: str = "queued"
+    # number of submissions coalesced into this job
+    requests: int = 1
+    submitted: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+    phases: Dict = field(default_factory=dict)
+    done: threading.Event = field(default_factory=threading.Event)
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    def as_dict(self, result: bool = False) -> Dict:
+        now = time.time()
+        m = self.model
+        res = dict(
+            id=self.id,
+            key=self.key,
+            status=self.status,
+            priority=self.priority,
+            requests=self.requests,
+            submitted=self.submitted,
+            started=self.started,
+            finished=self.finished,
+            queued_seconds=(self.started or self.finished or now) - self.submitted,
+            run_seconds=(self.finished or now) - self.started if self.started else None,
+            phases=m.timer.as_dict() if m is not None else self.phases,
+            error=self.error,
+        )
+        if result:
+            res["result"] = self.result
+        return res
+
+
+class Scheduler:
+    """Priority queue of jobs solved by *max_concurrent* worker threads.
+    Finished jobs are kept for status requests, up to *keep* latest.
+    Optional *cache* is used for all models, see *aloh.cache*.
+    """
+
+    def __init__(
+        self, max_concurrent: int = 1, cache: Optional[ResultCache] = None, keep=1000
+    ):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+        self.cache = cache
+        self.keep = keep
+        self.jobs: Dict[int, Job] = OrderedDict()
+        self._active: Dict[str, Job] = {}
+        self._heap: List = []
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._workers = [
+            threading.Thread(target=self._work, daemon=True)
+            for _ in range(max_concurrent)
+        ]
+        for t in self._workers:
+            t.start()
+
+    def submit(self, data: Dict) -> Job:
+        """Queue job from dict (see *read_job*) or return the queued or
+        running job with the same model fingerprint.
+        """
+        spec = read_job(data)
+        m = OptModel(spec["products"], spec["model_name"], spec["inventory_weight"])
+        m.solver = spec["solver"]
+        if self.cache is not None:
+            m.use_cache(self.cache)
+        key = m.fingerprint()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Scheduler is closed")
+            job = self._active.get(key)
+            if job is not None and job.active:
+                job.requests += 1
+                if job.status == "queued" and spec["priority"] > job.priority:
+                    job.priority = spec["priority"]
+                    self._push(job)
+                return job
+            job = Job(next(self._ids), key, m, spec["priority"], spec["timeout"])
+            self.jobs[job.id] = job
+            self._active[key] = job
+            self._push(job)
+            self._prune()
+            return job
+
+    def _push(self, job: Job):
+        # entries with old priority are skipped when popped
+        heapq.heappush(self._heap, (-job.priority, next(self._seq), job.priority, job))
+        self._cond.notify()
+
+    def _prune(self):
+        finished = [i for i, job in self.jobs.items() if not job.active]
+        for i in finished[: max(0, len(self.jobs) - self.keep)]:
+            del self.jobs[i]
+
+    def _next(self) -> Optional[Job]:
+        with self._cond:
+            while True:
+                while self._heap:
+                    _, _, priority, job = heapq.heappop(self._heap)
+                    if job.status == "queued" and priority == job.priority:
+                        job.status = "running"
+                        job.started = time.time()
+                        return job
+                if self._closed:
+                    return None
+                self._cond.wait()
+
+    def _work(self):
+        while True:
+            job = self._next()
+            if job is None:
+                return
+            self._run(job)
+
+    def _run(self, job: Job):
+        m = job.model
+        try:
+            key, hit = m.from_cache()
+            if not hit:
+                m.build()
+                # solver job is created under the lock, so *cancel* either
+                # sees it or the job is already cancelled here
+                with self._cond:
+                    if job.status == "cancelled":
+                        return self._finish(job, "cancelled")
+                    m.job = ExternalSolve(m.model, m.solver, timeout=job.timeout)
+                m.run_solver(m.job.run)
+                m.extract_result(key)
+            job.result = m.result()
+            status = "done"
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            status = "failed"
+        self._finish(job, "cancelled" if job.status == "cancelled" else status)
+
+    def _finish(self, job: Job, status: str):
+        with self._cond:
+            job.status = status
+            job.finished = time.time()
+            if job.model is not None:
+                job.phases = job.model.timer.as_dict()
+                job.model = None
+            if self._active.get(job.key) is job:
+                del self._active[job.key]
+        job.done.set()
+
+    def get(self, job_id: int) -> Job:
+        with self._cond:
+            try:
+                return self.jobs[job_id]
+            except KeyError:
+                raise KeyError(f"No job {job_id}")
+
+    def job_list(self) -> List[Job]:
+        """Jobs known to the scheduler, oldest first."""
+        with self._cond:
+            return list(self.jobs.values())
+
+    def wait(self, job_id: int, timeout: Optional[float] = None) -> Job:
+        job = self.get(job_id)
+        job.done.wait(timeout)
+        return job
+
+    def cancel(self, job_id: int) -> Job:
+        """Cancel a queued job or kill the solver of a running job."""
+        job = self.get(job_id)
+        with self._cond:
+            status = job.status
+            if job.active:
+                job.status = "cancelled"
+            if status == "running" and job.model.job is not None:
+                job.model.cancel()
+        if status == "queued":
+            self._finish(job, "cancelled")
+        return job
+
+    def close(self, wait: bool = True):
+        """Stop workers, queued jobs are cancelled and solvers of running
+        jobs are killed.
+        """
+        with self._cond:
+            self._closed = True
+            active = [job for job in self.jobs.values() if job.active]
+            self._cond.notify_all()
+        for job in active:
+            self.cancel(job.id)
+        if wait:
+            for t in self._workers:
+                t.join()
+
+
+class Handler(BaseHTTPRequestHandler):
+    scheduler: Scheduler
+
+    def _send(self, code: int, data):
+        body = json.dumps(data).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self, method: str):
+        url = urlparse(self.path)
+        parts = url.path.rstrip("/").split("/")
+        try:
+            if method == "GET" and url.path == "/health":
+                return self._send(200, self._health())
+            if parts[:2] != ["", "jobs"] or len(parts) > 3:
+                return self._send(404, dict(error=f"Not found: {url.path}"))
+            if len(parts) == 2:
+                if method == "GET":
+                    jobs = self.scheduler.job_list()
+                    return self._send(200, [job.as_dict() for job in jobs])
+                if method == "POST":
+                    size = int(self.headers.get("Content-Length", 0))
+                    data = json.loads(self.rfile.read(size))
+                    return self._send(202, self.scheduler.submit(data).as_dict())
+            else:
+                job_id = int(parts[2])
+                if method == "GET":
+                    wait = parse_qs(url.query).get("wait")
+                    if wait:
+                        job = self.scheduler.wait(job_id, float(wait[0]))
+                    else:
+                        job = self.scheduler.get(job_id)
+                    return self._send(200, job.as_dict(result=True))
+                if method == "DELETE":
+                    return self._send(200, self.scheduler.cancel(job_id).as_dict())
+            return self._send(405, dict(error=f"{method} not allowed"))
+        except KeyError as e:
+            return self._send(404, dict(error=str(e.args[0])))
+        except ValueError as e:
+            return self._send(400, dict(error=str(e)))
+        except Exception as e:
+            return self._send(500, dict(error=f"{type(e).__name__}: {e}"))
+
+    def _health(self) -> Dict:
+        jobs = self.scheduler.job_list()
+        return dict(
+            status="ok",
+            max_concurrent=self.scheduler.max_concurrent,
+            jobs={s: sum(job.status == s for job in jobs) for s in STATUSES},
+        )
+
+    def do_GET(self):
+        self._route("GET")
+
+    def do_POST(self):
+        self._route("POST")
+
+    def do_DELETE(self):
+        self._route("DELETE")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(
+    scheduler: Scheduler, host: str = "127.0.0.1", port: int = 8765
+) -> ThreadingHTTPServer:
+    """HTTP server for *scheduler*, port 0 selects a free port."""
+    handler = type("SchedulerHandler", (Handler,), dict(scheduler=scheduler))
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def check_solvers() -> Dict[str, bool]:
+    """Solver availability, checked once at start."""
+    return {name: available(name) for name in SOLVER_NAMES}
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    max_concurrent: int = 1,
+    cache: Optional[ResultCache] = None,
+):
+    print(f"Solvers available: {check_solvers()}")
+    scheduler = Scheduler(max_concurrent, cache)
+    server = make_server(scheduler, host, port)
+    print(f"Serving on http://{host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        scheduler.close()
+
+
+class Client:
+    """Client of the service at *url*."""
+
+    def __init__(self, url: str = "http://127.0.0.1:8765"):
+        self.url = url.rstrip("/")
+
+    def _request(self, method: str, path: str, data=None, timeout=None):
+        body = None if data is None else json.dumps(data).encode()
+        req = urllib.request.Request(self.url + path, body, method=method)
+        req.add_header("Content-Type", "application/json")
+        with urllib.request.urlopen(req, timeout=timeout) as f:
+            return json.load(f)
+
+    def submit(self, job: Dict) -> Dict:
+        return self._request("POST", "/jobs", job)
+
+    def status(self, job_id: int) -> Dict:
+        return self._request("GET", f"/jobs/{job_id}")
+
+    def wait(self, job_id: int, timeout: float = 3600) -> Dict:
+        path = f"/jobs/{job_id}?wait={timeout}"
+        return self._request("GET", path, timeout=timeout + 10)
+
+    def cancel(self, job_id: int) -> Dict:
+        return self._request("DELETE", f"/jobs/{job_id}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="concurrent solves")
+    parser.add_argument("--cache", help="result cache directory")
+    args = parser.parse_args(argv)
+    cache = ResultCache(args.cache) if args.cache else None
+    serve(args.host, args.port, args.workers, cache)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Split a model into independent product groups and solve them in parallel.
+
+Products are linked only by requirements (bill of materials). Connected
+components of the requirement graph share nothing in the model except
+the objective, which is a sum over products, so each component can be
+solved as its own *OptModel* and the results merged back. The merged
+solution is optimal for the full model.
+
+Products without orders that no ordered product requires are dropped:
+they have no demand, their production is zero.
+
+Component models end on the last order day of the component, production
+is padded with zeros up to the last day of all orders. This is exact:
+with the closed sum constraint nothing is produced after the last use.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from time import perf_counter
+from typing import Dict, List, Optional
+
+from aloh.interface import Product, _n_days, get_materials, order_dict
+from aloh.scenarios import worker_threads
+from aloh.small import OptModel
+from aloh.solvers import SolverSettings
+
+__all__ = ["DecomposedModel", "components", "demanded_products"]
+
+
+def demanded_products(products: List[Product]) -> List[str]:
+    """Names of products that have orders or are required by them."""
+    return _demanded_products(products, get_materials(products).full_requirements())
+
+
+def _demanded_products(products: List[Product], full_req) -> List[str]:
+    orders = order_dict(products)
+    res = set()
+    for p in products:
+        if len(orders[p.name]):
+            res.update(full_req[p.name])
+    return [p.name for p in products if p.name in res]
+
+
+def components(products: List[Product]) -> List[List[str]]:
+    """Groups of product names connected by requirements, products without
+    demand (see *demanded_products*) are not included. Requirements are
+    full requirements, as used in the model, that omit very small values.
+    """
+    full_req = get_materials(products).full_requirements()
+    names = _demanded_products(products, full_req)
+    parent = {p: p for p in names}
+
+    def root(p):
+        while parent[p] != p:
+            parent[p] = parent[parent[p]]
+            p = parent[p]
+        return p
+
+    # products required by a demanded product are demanded too
+    for p in names:
+        for p2 in full_req[p]:
+            parent[root(p2)] = root(p)
+    groups: Dict[str, List[str]] = {}
+    for p in names:
+        groups.setdefault(root(p), []).append(p)
+    return list(groups.values())
+
+
+def solve_component(
+    products: List[Product],
+    model_name: str,
+    inventory_weight: float,
+    solver: SolverSettings,
+):
+    m = OptModel(products, model_name, inventory_weight)
+    m.solver = solver
+    ac, xs = m.evaluate()
+    return ac, xs, m.solve_info
+
+
+class DecomposedModel:
+    """Solve connected components of *products* as separate models
+    in a process pool of *max_workers*, see *aloh.scenarios.run_scenarios*
+    for *solver_threads*.
+    """
+
+    def __init__(
+        self,
+        products: List[Product],
+        model_name: str,
+        inventory_weight: float,
+        max_workers: Optional[int] = None,
+        solver_threads: Optional[int] = None,
+    ):
+        self.products = products
+        self.model_name = model_name
+        self.inventory_weight = inventory_weight
+        self.max_workers = max_workers
+        self.solver_threads = solver_threads
+        self.solver = SolverSettings(msg=False)
+        self.components = components(products)
+        if not self.components:
+            raise ValueError("No products with orders")
+        self.n_days = _n_days(order_dict(products))
+        self.accept: Dict[str, List[int]] = {}
+        self.prod: Dict[str, List[float]] = {}
+        self.solve_info: Dict = {}
+        self.time_elapsed = 0
+
+    def component_products(self) -> List[List[Product]]:
+        by_name = {p.name: p for p in self.products}
+        return [[by_name[name] for name in group] for group in self.components]
+
+    def evaluate(self):
+        start_time = perf_counter()
+        groups = self.component_products()
+        max_workers = self.max_workers or min(len(groups), os.cpu_count() or 1)
+        threads = worker_threads(max_workers, self.solver_threads)
+        solver = replace(self.solver, threads=threads)
+        args = [
+            (ps, f"{self.model_name}_{i}", self.inventory_weight, solver)
+            for i, ps in enumerate(groups)
+        ]
+        if max_workers == 1:
+            results = [solve_component(*a) for a in args]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = [pool.submit(solve_component, *a) for a in args]
+                results = [f.result() for f in futures]
+        # products without demand
+        self.accept = {p.name: [0] * len(p.orders) for p in self.products}
+        self.prod = {p.name: [0.0] * self.n_days for p in self.products}
+        for ac, xs, _ in results:
+            self.accept.update(ac)
+            for p, values in xs.items():
+                self.prod[p] = values + [0.0] * (self.n_days - len(values))
+        infos = [info for _, _, info in results]
+        statuses = {info["status"] for info in infos}
+        self.time_elapsed = perf_counter() - start_time
+        self.solve_info = dict(
+            solver=solver.as_dict(),
+            status=statuses.pop() if len(statuses) == 1 else "Mixed",
+            objective=sum(info["objective"] or 0 for info in infos),
+            time_elapsed=self.time_elapsed,
+            components=infos,
+        )
+        return self.accepted_orders(), self.estimated_production()
+
+    def accepted_orders(self) -> Dict[str, List[int]]:
+        return self.accept
+
+    def estimated_production(self) -> Dict[str, List[float]]:
+        return self.prod
+
+    def objective_value(self) -> float:
+        return self.solve_info["objective"]
@@ -0,0 +1,205 @@
+"""MPS export and out-of-process solve.
+
+*write_mps* saves a PuLP model in free or fixed MPS format, gzip-compressed
+if the file name ends with ".gz".
+
+*ExternalSolve* writes the model to a temporary MPS file and runs CBC on it
+in a child process. Solver log lines are passed to a callback as they
+arrive. The child runs in its own process group, so *cancel* (from any
+thread) or a wall clock *timeout* kills the solver and its children, but
+not the calling process:
+
+    job = ExternalSolve(m.model, m.solver, on_line=print, timeout=600)
+    threading.Timer(60, job.cancel).start()
+    status = job.run()
+"""
+
+import gzip
+import os
+import shutil
+import signal
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+import pulp
+
+from aloh.solvers import SolverSettings
+
+__all__ = ["write_mps", "ExternalSolve", "SolveStopped"]
+
+
+class SolveStopped(RuntimeError):
+    """Solver process was cancelled or timed out, no solution is available."""
+
+
+def write_mps(
+    model: pulp.LpProblem, filename, fixed: bool = False, objsense: bool = False
+):
+    """Write *model* to MPS file *filename*.
+
+    - *fixed*: rename variables and constraints to 8 character names
+      (X0000000, C0000000) as required by fixed MPS columns, otherwise
+      free MPS with model names is written;
+    - *objsense*: write OBJSENSE section for maximisation models, by default
+      the sense is a comment (some readers, including CBC, reject OBJSENSE).
+
+    File is gzip-compressed if *filename* ends with ".gz". Returns variables
+    and, for fixed format, name maps as *pulp.LpProblem.writeMPS* does.
+    """
+    path = Path(filename)
+    rename = 1 if fixed else 0
+    if path.suffix != ".gz":
+        return model.writeMPS(str(path), rename=rename, with_objsense=objsense)
+    with tempfile.TemporaryDirectory() as tmp:
+        plain = Path(tmp) / path.stem
+        res = model.writeMPS(str(plain), rename=rename, with_objsense=objsense)
+        with open(plain, "rb") as src, gzip.open(path, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+    return res
+
+
+class ExternalSolve:
+    """Solve *model* with CBC in a child process.
+
+    *on_line* is called with every solver log line (from a reader thread).
+    *timeout* is wall clock seconds for the child process, unlike
+    *SolverSettings.time_limit* it kills the solver without a solution.
+    Temporary files go to a new directory in *workdir* and are removed
+    after the solve.
+    """
+
+    def __init__(
+        self,
+        model: pulp.LpProblem,
+        solver: SolverSettings,
+        on_line: Optional[Callable[[str], None]] = None,
+        timeout: Optional[float] = None,
+        workdir: Optional[str] = None,
+    ):
+        if solver.name != "CBC":
+            raise ValueError(f"Out of process solve supports CBC, not {solver.name}")
+        self.model = model
+        self.solver = solver
+        self.on_line = on_line
+        self.timeout = timeout
+        self.workdir = workdir
+        self.process: Optional[subprocess.Popen] = None
+        self.stopped: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid if self.process else None
+
+    def command(self, mps_path: str, sol_path: str):
+        cbc = self.solver.make()
+        args = [cbc.path, mps_path]
+        if self.model.sense == pulp.LpMaximize:
+            args.append("-max")
+        if cbc.timeLimit is not None:
+            args.extend(["-sec", str(cbc.timeLimit)])
+        for option in cbc.options + cbc.getOptions():
+            args.extend(("-" + option).split())
+        args.extend(["-branch", "-printingOptions", "all", "-solution", sol_path])
+        return args
+
+    def run(self) -> int:
+        """Solve and set variable values of the model, returns PuLP status.
+        Raises *SolveStopped* if the solve was cancelled or timed out.
+        """
+        tmp = tempfile.mkdtemp(prefix="aloh_", dir=self.workdir)
+        try:
+            mps_path, sol_path = self.paths(tmp)
+            names = self.write(mps_path)
+            self._start(self.command(mps_path, sol_path))
+            self._wait()
+            return self.read_solution(sol_path, names)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    @staticmethod
+    def paths(tmp: str):
+        """Model and solution files in directory *tmp*."""
+        return os.path.join(tmp, "model.mps"), os.path.join(tmp, "model.sol")
+
+    def write(self, mps_path: str):
+        """Write fixed MPS file, returns variables and name maps."""
+        vs, var_names, con_names, _ = write_mps(self.model, mps_path, fixed=True)
+        return vs, var_names, con_names
+
+    def read_solution(self, sol_path: str, names) -> int:
+        """Set variable values of the model from solution file, returns status."""
+        if self.stopped:
+            raise SolveStopped(f"Solver process {self.pid} {self.stopped}")
+        if not os.path.exists(sol_path):
+            raise RuntimeError(
+                f"Solver process {self.pid} exited with code "
+                f"{self.process.returncode} and no solution"
+            )
+        cbc = self.solver.make()
+        status, values, reduced_costs, shadow_prices, slacks, sol_status = (
+            cbc.readsol_MPS(sol_path, self.model, *names)
+        )
+        self.model.assignVarsVals(values)
+        self.model.assignVarsDj(reduced_costs)
+        self.model.assignConsPi(shadow_prices)
+        self.model.assignConsSlack(slacks, activity=True)
+        self.model.assignStatus(status, sol_status)
+        return status
+
+    def _start(self, args):
+        with self._lock:
+            if self.stopped:
+                return
+            self.process = subprocess.Popen(
+                args,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1,
+                start_new_session=True,
+            )
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+
+    def _read(self):
+        for line in self.process.stdout:
+            line = line.rstrip("\n")
+            if self.solver.msg:
+                print(line)
+            if self.on_line:
+                self.on_line(line)
+        self.process.stdout.close()
+
+    def _wait(self):
+        if self.process is None:
+            return
+        try:
+            self.process.wait(timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            self._kill(f"timed out after {self.timeout} sec")
+            self.process.wait()
+        self._reader.join()
+
+    def _kill(self, reason: str):
+        with self._lock:
+            if self.stopped or self._finished():
+                return
+            self.stopped = reason
+            if self.process is None:
+                return
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except (AttributeError, ProcessLookupError):
+                self.process.kill()
+
+    def _finished(self) -> bool:
+        return self.process is not None and self.process.poll() is not None
+
+    def cancel(self):
+        """Kill the solver process, safe to call from another thread."""
+        self._kill("cancelled")
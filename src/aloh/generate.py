@@ -1,10 +1,32 @@
-"""Generate fake order volumes and prices."""
+"""Generate fake order volumes and prices.
+
+*generate_orders* makes a list of order dicts with the *random* module.
+*random_orders*, *order_chunks* and *random_book* draw orders in bulk
+from a seeded NumPy generator and return *Orders* arrays, so that large
+books are reproducible and fast to make:
+
+    products = [Product(f"P{i}", capacity=100, unit_cost=50) for i in range(10)]
+    random_book(products, n_days=365, oversubscription=1.5,
+                pricer=Price(mean=100, delta=10),
+                sizer=Volume(min_order=20, max_order=150), seed=0)
+"""
 
 from dataclasses import dataclass
 from random import choice, uniform
-from typing import List
+from typing import Callable, Iterator, List, Optional, Union
+
+import numpy as np  # type: ignore
 
-__all__ = ["Price", "Volume", "generate_orders"]
+from aloh.orders import Orders
+
+__all__ = [
+    "Price",
+    "Volume",
+    "generate_orders",
+    "order_chunks",
+    "random_orders",
+    "random_book",
+]
 
 
 def rounds(x, step=1):
@@ -23,6 +45,11 @@ class Price:
         p = uniform(self.mean - self.delta, self.mean + self.delta)
         return round(p, 1)
 
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        """*n* prices from *rng*."""
+        p = rng.uniform(self.mean - self.delta, self.mean + self.delta, n)
+        return np.round(p, 1)
+
 
 @dataclass
 class Volume:
@@ -36,6 +63,11 @@ class Volume:
         x = uniform(self.min_order, self.max_order)
         return rounds(x, self.round_to)
 
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        """*n* volumes from *rng*."""
+        x = rng.uniform(self.min_order, self.max_order, n)
+        return np.round(x / self.round_to) * self.round_to
+
 
 def generate_volumes(total_volume: float, sizer: Volume) -> List[float]:
     xs = []
@@ -77,3 +109,106 @@ def elem(d, v, p):
 
 def by_day_and_price(x):
     return x["day"], x["price"]
+
+
+def sample_volumes(
+    rng: np.random.Generator, total_volume: float, sizer: Volume, chunk_size: int
+) -> Iterator[np.ndarray]:
+    """Volumes adding up to *total_volume* in chunks of *chunk_size*,
+    the last volume is the remainder as in *generate_volumes*.
+    """
+    if sizer.max_order <= 0:
+        raise ValueError("Maximum order volume must be positive")
+    remaining = total_volume
+    while remaining > 0:
+        xs = sizer.sample(rng, chunk_size)
+        cum = np.cumsum(xs)
+        k = int(np.searchsorted(cum, remaining))
+        if k == chunk_size:
+            remaining -= cum[-1]
+            yield xs
+        else:
+            xs = xs[: k + 1]
+            xs[k] = remaining - (cum[k - 1] if k else 0)
+            yield xs
+            return
+
+
+def order_chunks(
+    n_days: int,
+    total_volume: float,
+    pricer: Price,
+    sizer: Volume,
+    seed=None,
+    chunk_size: int = 100_000,
+) -> Iterator[Orders]:
+    """Lazily generate orders of *total_volume* as *Orders* of up to
+    *chunk_size* orders, each chunk is sorted by day and price.
+    *seed* is an integer or *numpy.random.Generator*, same seed and
+    *chunk_size* give same orders.
+    """
+    rng = np.random.default_rng(seed)
+    for volumes in sample_volumes(rng, total_volume, sizer, chunk_size):
+        n = len(volumes)
+        days = rng.integers(0, n_days, n)
+        prices = pricer.sample(rng, n)
+        ix = np.lexsort((prices, days))
+        yield Orders(days[ix], volumes[ix], prices[ix])
+
+
+def random_orders(
+    n_days: int,
+    total_volume: float,
+    pricer: Price,
+    sizer: Volume,
+    seed=None,
+    chunk_size: int = 100_000,
+) -> Orders:
+    """Orders from *order_chunks* sorted by day and price,
+    same as *generate_orders* but seeded and as arrays.
+    """
+    chunks = list(order_chunks(n_days, total_volume, pricer, sizer, seed, chunk_size))
+    if not chunks:
+        return Orders()
+    days = np.concatenate([c.day for c in chunks])
+    volumes = np.concatenate([c.volume for c in chunks])
+    prices = np.concatenate([c.price for c in chunks])
+    ix = np.lexsort((prices, days))
+    return Orders(days[ix], volumes[ix], prices[ix])
+
+
+Distribution = Union[Price, Volume, Callable]
+
+
+def _for_product(x: Distribution, product):
+    return x if isinstance(x, (Price, Volume)) else x(product)
+
+
+def random_book(
+    products: List,
+    n_days: int,
+    pricer: Distribution,
+    sizer: Distribution,
+    oversubscription: float = 1.0,
+    seed: Optional[int] = None,
+    chunk_size: int = 100_000,
+) -> List:
+    """Set orders of *products* with total volume of *oversubscription*
+    times product capacity over *n_days*. *pricer* and *sizer* are
+    *Price* and *Volume* or functions of product that return them.
+    Each product gets own random stream spawned from *seed*, so its orders
+    do not depend on other products.
+    """
+    streams = np.random.SeedSequence(seed).spawn(len(products))
+    for p, stream in zip(products, streams):
+        if not p.capacity:
+            raise ValueError(f"Product {p.name} needs positive capacity")
+        p.orders = random_orders(
+            n_days,
+            total_volume=oversubscription * p.capacity * n_days,
+            pricer=_for_product(pricer, p),
+            sizer=_for_product(sizer, p),
+            seed=np.random.default_rng(stream),
+            chunk_size=chunk_size,
+        )
+    return products
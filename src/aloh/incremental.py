@@ -0,0 +1,91 @@
+"""Change orders of a solved model in place and re-solve with a warm start.
+
+*IncrementalModel* keeps the built *pulp.LpProblem* and the solution
+of the previous run. Adding, removing and repricing orders edits
+the objective and constraint coefficients of that problem, so a re-solve
+does not pay for model construction. The solver starts from the last
+incumbent, which stays feasible after new orders are added (new orders
+start as not accepted).
+
+Model days are fixed at construction, new orders must fall within them.
+"""
+
+from typing import List
+
+import pulp
+
+from aloh.interface import Product
+from aloh.small import OptModel
+
+
+class IncrementalModel(OptModel):
+    def __init__(
+        self, products: List[Product], model_name: str, inventory_weight: float
+    ):
+        super().__init__(products, model_name, inventory_weight, inventory="balance")
+        self.full_req = self.ms.full_requirements()
+        self.removed = {p: set() for p in self.products}
+
+    def evaluate(self):
+        """Solve the model, warm starting from previous solution if there is one."""
+        if self.is_built:
+            self.solver.warm_start = True
+        self.build()
+        self.solve()
+        return self.accepted_orders(), self.estimated_production()
+
+    def _constraint(self, name: str):
+        return self.model.constraints[name]
+
+    def add_order(self, product: str, day: int, volume: float, price: float) -> int:
+        """Add new order and return its index in the list of *product* orders."""
+        # expressions must exist before the order list changes
+        self.make_expressions()
+        if day not in self.days:
+            raise ValueError(
+                f"Order day {day} is outside of model days "
+                f"{self.days[0]}..{self.days[-1]}"
+            )
+        i = len(self.order_dict[product])
+        a = pulp.LpVariable(f"Accept_{product}_{i}", cat="Binary")
+        a.setInitialValue(0)
+        self.order_dict[product].append(day, volume, price)
+        self.revision += 1
+        self.accept_dict[product].append(a)
+        # expressions
+        self.ship[product][day] += a * volume
+        self.sales[product][day] += a * volume * price
+        for p2, r in self.full_req[product].items():
+            self.req[p2][day] += a * r * volume
+        if not self.is_built:
+            return i
+        # objective and constraints that include shipment or requirement
+        self.model.objective.addterm(a, volume * price)
+        for p2, r in self.full_req[product].items():
+            self._constraint(f"Inventory_balance_{p2}_{day}").addterm(a, r * volume)
+            self._constraint(f"Closed_sum_for_{p2}").addterm(a, -r * volume)
+            self._constraint(f"Cumulative_requirement_{p2}_{day}").addterm(
+                a, -r * volume
+            )
+        return i
+
+    def remove_order(self, product: str, i: int):
+        """Remove order *i* of *product*. Order indices of other orders
+        do not change, a removed order is reported as not accepted.
+        """
+        a = self.accept_dict[product][i]
+        a.upBound = 0
+        a.setInitialValue(0)
+        self.removed[product].add(i)
+        self.revision += 1
+
+    def reprice_order(self, product: str, i: int, price: float):
+        """Set new *price* for order *i* of *product*."""
+        orders = self.order_dict[product]
+        orders.price[i] = price
+        self.revision += 1
+        day, volume = int(orders.day[i]), float(orders.volume[i])
+        a = self.accept_dict[product][i]
+        self.sales[product][day][a] = volume * price
+        if self.is_built:
+            self.model.objective[a] = volume * price
@@ -1,31 +1,26 @@
 """Interface to define inputs for the model. Use *Product* class."""
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
+from aloh.orders import Order, Orders, as_orders
 from aloh.requirements import Materials
 
 
-@dataclass
-class Order:
-    """Order parameters."""
-
-    day: int
-    volume: float
-    price: float
-
-
 @dataclass
 class Product:
     name: str
     capacity: float = 0
     unit_cost: Optional[float] = None
     storage_days: Optional[int] = None
-    orders: List = field(default_factory=list)
+    orders: Union[Orders, List[Dict]] = field(default_factory=Orders)
     requires: Dict = field(default_factory=dict)
 
     def add_order(self, day: int, volume: float, price: float):
-        x = dict(day=day, volume=volume, price=price)
-        self.orders.append(x)
+        if isinstance(self.orders, Orders):
+            self.orders.append(day, volume, price)
+        else:
+            x = dict(day=day, volume=volume, price=price)
+            self.orders.append(x)
 
     def require(self, product: str, volume: float):
         self.requires[product] = volume
@@ -48,12 +43,13 @@ def storage_days(products, max_allowed_storage_days: int):
     return {p.name: sub(p.storage_days) for p in products}
 
 
-def order_dict(products):
-    return {p.name: [Order(**abc) for abc in p.orders] for p in products}
+def order_dict(products) -> Dict[str, Orders]:
+    """Copies of product orders, changes to them do not affect *products*."""
+    return {p.name: as_orders(p.orders).copy() for p in products}
 
 
 def _max_day(order_dict):
-    return max([order.day for orders in order_dict.values() for order in orders])
+    return max([int(orders.day.max()) for orders in order_dict.values() if len(orders)])
 
 
 def _n_days(order_dict):
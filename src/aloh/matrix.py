@@ -0,0 +1,252 @@
+"""Matrix form of the order selection and production model.
+
+*MatrixModel* formulates the same problem as *aloh.small.OptModel*, but
+assembles the constraint matrix directly as NumPy/SciPy sparse arrays
+and solves it with HiGHS bundled with SciPy (*scipy.optimize.milp*).
+No PuLP objects are created, so model build time does not depend on
+per-coefficient Python overhead.
+
+Variables are stacked in one vector:
+
+    x = [prod, inv, cum_req (products * days each), accept (orders)]
+
+Requires scipy (pip install aloh[matrix]).
+"""
+
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Dict, List, Optional
+
+import numpy as np  # type: ignore
+from scipy import optimize, sparse  # type: ignore
+
+import aloh.interface
+from aloh.interface import Product
+from aloh.solvers import SolverSettings
+from aloh.timing import logger
+
+
+@dataclass
+class LinearProgram:
+    """Minimise c @ x subject to row_lb <= A @ x <= row_ub and lb <= x <= ub.
+    Variables with integrality == 1 are integer.
+    """
+
+    c: np.ndarray
+    A: sparse.csr_matrix
+    row_lb: np.ndarray
+    row_ub: np.ndarray
+    lb: np.ndarray
+    ub: np.ndarray
+    integrality: np.ndarray
+
+    @property
+    def shape(self):
+        return self.A.shape
+
+
+def order_arrays(products: List[str], order_dict):
+    """Product index, day, volume and price of all orders as arrays."""
+    orders = [order_dict[p] for p in products]
+    return (
+        np.repeat(np.arange(len(products)), [len(x) for x in orders]),
+        np.concatenate([x.day for x in orders]).astype(int),
+        np.concatenate([x.volume for x in orders]).astype(float),
+        np.concatenate([x.price for x in orders]).astype(float),
+    )
+
+
+class MatrixModel:
+    # report with "aloh" logger instead of print, as in OptModel
+    use_logging = False
+
+    def __init__(self, products: List[Product], inventory_weight: float):
+        # model parameters
+        self.inventory_weight = inventory_weight
+        self.time_elapsed = 0
+
+        #  plant and order parameters
+        self.products = aloh.interface.names(products)
+        self.capacities = aloh.interface.capacities(products)
+        self.unit_costs = aloh.interface.unit_costs(products)
+        self.order_dict = aloh.interface.order_dict(products)
+        self.days = aloh.interface.days(self.order_dict)
+        self.storage_days = aloh.interface.storage_days(
+            products, max_allowed_storage_days=self.n_days
+        )
+        self.ms = aloh.interface.get_materials(products)
+        self.lp: Optional[LinearProgram] = None
+        self.solver = SolverSettings("HiGHS", msg=False)
+        self.solve_info: Dict = {}
+        self.result = None
+
+    @property
+    def n_days(self):
+        return self.days[-1] + 1
+
+    @property
+    def n_orders(self):
+        return sum(len(orders) for orders in self.order_dict.values())
+
+    # variable positions in x
+
+    def prod_ix(self, i, d):
+        return i * self.n_days + d
+
+    def inv_ix(self, i, d):
+        return (len(self.products) + i) * self.n_days + d
+
+    def cum_req_ix(self, i, d):
+        return (2 * len(self.products) + i) * self.n_days + d
+
+    def accept_ix(self, k):
+        return 3 * len(self.products) * self.n_days + k
+
+    def build(self) -> LinearProgram:
+        P, D, N = len(self.products), self.n_days, self.n_orders
+        n_vars = 3 * P * D + N
+        product_ix, day, volume, price = order_arrays(self.products, self.order_dict)
+        order_k = np.arange(N)
+        pd_grid = np.arange(P * D)
+        p_grid, d_grid = np.divmod(pd_grid, D)
+
+        # Objective: sales - costs - inventory_weight * inventory -> max
+        c = np.zeros(n_vars)
+        unit_costs = np.array([self.unit_costs[p] for p in self.products], dtype=float)
+        c[self.prod_ix(p_grid, d_grid)] = unit_costs[p_grid]
+        c[self.inv_ix(p_grid, d_grid)] = self.inventory_weight
+        c[self.accept_ix(order_k)] = -volume * price
+
+        # Bounds: 0 <= prod <= capacity, inv >= 0, accept is binary.
+        # Zero end of period inventory is the closed sum constraint.
+        caps = np.array([self.capacities[p] for p in self.products], dtype=float)
+        lb = np.zeros(n_vars)
+        ub = np.full(n_vars, np.inf)
+        ub[self.prod_ix(p_grid, d_grid)] = caps[p_grid]
+        ub[self.inv_ix(np.arange(P), D - 1)] = 0
+        ub[self.accept_ix(order_k)] = 1
+        integrality = np.zeros(n_vars)
+        integrality[self.accept_ix(order_k)] = 1
+
+        rows, cols, vals = [], [], []
+
+        def add(r, k, v):
+            r, k = np.broadcast_arrays(r, k)
+            rows.append(r.ravel())
+            cols.append(k.ravel())
+            vals.append(np.broadcast_to(v, r.shape).ravel().astype(float))
+
+        # Inventory balance, rows 0..P*D-1:
+        # inv[p,d] - inv[p,d-1] - prod[p,d] + req[p,d] == 0
+        add(pd_grid, self.inv_ix(p_grid, d_grid), 1)
+        later = d_grid > 0
+        add(pd_grid[later], self.inv_ix(p_grid[later], d_grid[later] - 1), -1)
+        add(pd_grid, self.prod_ix(p_grid, d_grid), -1)
+        # req[p,d] = sum over orders of q on day d of R(q,p) * volume * accept,
+        # also enters cumulative requirement rows P*D..2*P*D-1 with minus sign
+        full_req = self.ms.full_requirements()
+        offset = P * D
+        for q, q_name in enumerate(self.products):
+            mask = product_ix == q
+            for p_name, r in full_req[q_name].items():
+                p = self.products.index(p_name)
+                k = self.accept_ix(order_k[mask])
+                add(p * D + day[mask], k, r * volume[mask])
+                add(offset + p * D + day[mask], k, -r * volume[mask])
+
+        # Cumulative requirement: cum_req[p,d] - cum_req[p,d-1] - req[p,d] == 0
+        add(offset + pd_grid, self.cum_req_ix(p_grid, d_grid), 1)
+        add(
+            offset + pd_grid[later],
+            self.cum_req_ix(p_grid[later], d_grid[later] - 1),
+            -1,
+        )
+
+        # Storage limit, rows 2*P*D..3*P*D-1:
+        # inv[p,d] <= req of p over days d+1..e = cum_req[p,e] - cum_req[p,d],
+        # where e = min(d + s, last day)
+        offset = 2 * P * D
+        add(offset + pd_grid, self.inv_ix(p_grid, d_grid), 1)
+        s = np.array([self.storage_days[p] for p in self.products])
+        end = np.minimum(d_grid + s[p_grid], D - 1)
+        window = end > d_grid
+        add(offset + pd_grid[window], self.cum_req_ix(p_grid, end)[window], -1)
+        add(offset + pd_grid[window], self.cum_req_ix(p_grid, d_grid)[window], 1)
+
+        A = sparse.csr_matrix(
+            (np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(3 * P * D, n_vars),
+        )
+        row_lb = np.concatenate([np.zeros(2 * P * D), np.full(P * D, -np.inf)])
+        row_ub = np.zeros(3 * P * D)
+        self.lp = LinearProgram(c, A, row_lb, row_ub, lb, ub, integrality)
+        return self.lp
+
+    def use_solver(
+        self,
+        time_limit: Optional[float] = None,
+        gap: Optional[float] = None,
+        presolve: Optional[bool] = None,
+        msg: bool = False,
+    ):
+        """Set HiGHS options, see *SolverSettings*."""
+        self.solver = SolverSettings("HiGHS", None, time_limit, gap, presolve, msg)
+        return self
+
+    def solve(self):
+        """Solve with HiGHS via *scipy.optimize.milp*."""
+        if self.lp is None:
+            self.build()
+        lp = self.lp
+        start = perf_counter()
+        self.result = optimize.milp(
+            lp.c,
+            integrality=lp.integrality,
+            bounds=optimize.Bounds(lp.lb, lp.ub),
+            constraints=optimize.LinearConstraint(lp.A, lp.row_lb, lp.row_ub),
+            options=self.solver.milp_options(),
+        )
+        self.time_elapsed = perf_counter() - start
+        self.solve_info = dict(
+            solver=self.solver.as_dict(),
+            status=self.result.message,
+            objective=None if self.result.fun is None else -self.result.fun,
+            time_elapsed=self.time_elapsed,
+        )
+        self.report("Solved in {:.3f} sec".format(self.time_elapsed))
+        if self.result.x is None:
+            raise RuntimeError(f"No solution found: {self.result.message}")
+
+    def report(self, message: str):
+        """Log *message* with *use_logging*, otherwise print it if solver
+        messages are on.
+        """
+        if self.use_logging:
+            logger.info(message)
+        elif self.solver.msg:
+            print(message)
+
+    def evaluate(self):
+        self.build()
+        self.solve()
+        return self.accepted_orders(), self.estimated_production()
+
+    @property
+    def objective_value(self):
+        return -self.result.fun
+
+    def estimated_production(self):
+        x = self.result.x
+        return {
+            p: [x[self.prod_ix(i, d)] for d in self.days]
+            for i, p in enumerate(self.products)
+        }
+
+    def accepted_orders(self) -> Dict[str, List[int]]:
+        x = self.result.x
+        res, k = {}, 0
+        for p in self.products:
+            n = len(self.order_dict[p])
+            res[p] = [int(round(a)) for a in x[self.accept_ix(np.arange(k, k + n))]]
+            k += n
+        return res
@@ -0,0 +1,276 @@
+"""Columnar order storage and bulk order loading.
+
+*Orders* keeps orders of one product as day, volume and price arrays.
+Bulk loaders read a table of (product, day, volume, price) from a pandas
+dataframe, a NumPy structured array or a CSV/Parquet file and split it
+by product without creating a Python object per order:
+
+    products = [Product("A", capacity=100, unit_cost=0.5), ...]
+    load_orders(products, "orders.csv")
+    m = OptModel(products, "model", inventory_weight=0.1)
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Union
+
+import numpy as np  # type: ignore
+
+__all__ = ["Order", "OrderView", "Orders", "read_orders", "load_orders"]
+
+COLUMNS = ["product", "day", "volume", "price"]
+
+
+FIELDS = COLUMNS[1:]
+
+
+@dataclass
+class Order:
+    """Order parameters."""
+
+    __slots__ = ("day", "volume", "price")
+
+    day: int
+    volume: float
+    price: float
+
+
+class OrderView:
+    """Order *i* of *Orders*. Reading and setting day, volume and price
+    as attributes or dict keys (``order["price"]``) goes to the arrays.
+    """
+
+    __slots__ = ("_orders", "_i")
+
+    def __init__(self, orders: "Orders", i: int):
+        self._orders = orders
+        self._i = i
+
+    def __getitem__(self, key: str):
+        if key not in FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value):
+        if key not in FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __eq__(self, other):
+        if not isinstance(other, (Order, OrderView, dict)):
+            return NotImplemented
+        return _row(self) == _row(other)
+
+    def __repr__(self):
+        return "Order(day={}, volume={}, price={})".format(*_row(self))
+
+    def as_order(self) -> Order:
+        return Order(*_row(self))
+
+
+def _view_property(name: str, cast):
+    def fget(self):
+        return cast(getattr(self._orders, name)[self._i])
+
+    def fset(self, value):
+        getattr(self._orders, name)[self._i] = value
+
+    return property(fget, fset)
+
+
+OrderView.day = _view_property("day", int)
+OrderView.volume = _view_property("volume", float)
+OrderView.price = _view_property("price", float)
+
+
+class Orders:
+    """Orders of one product as arrays *day* (int32), *volume* and *price*
+    (float64). Indexing and iteration yield *OrderView* objects, so *Orders*
+    can replace a list of orders. Arrays are allocated with spare capacity,
+    *append* doubles it when full.
+    """
+
+    def __init__(self, day=(), volume=(), price=()):
+        self._day = _order_days(day)
+        self._volume = np.array(volume, dtype=np.float64).reshape(-1)
+        self._price = np.array(price, dtype=np.float64).reshape(-1)
+        self._n = len(self._day)
+        if not self._n == len(self._volume) == len(self._price):
+            raise ValueError("Order columns must have same length")
+
+    @classmethod
+    def from_records(cls, records: Iterable):
+        """Create from dicts with keys day, volume, price or from *Order* objects."""
+        rows = [_row(r) for r in records]
+        if not rows:
+            return cls()
+        return cls(*zip(*rows))
+
+    @property
+    def day(self) -> np.ndarray:
+        return self._day[: self._n]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self._volume[: self._n]
+
+    @property
+    def price(self) -> np.ndarray:
+        return self._price[: self._n]
+
+    @property
+    def capacity(self) -> int:
+        return len(self._day)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the arrays, including spare capacity."""
+        return self._day.nbytes + self._volume.nbytes + self._price.nbytes
+
+    def __len__(self):
+        return self._n
+
+    def _index(self, i: int) -> int:
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError("order index out of range")
+        return i
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.take(i)
+        return OrderView(self, self._index(i))
+
+    def __delitem__(self, i: int):
+        i = self._index(i)
+        for x in (self._day, self._volume, self._price):
+            x[i : self._n - 1] = x[i + 1 : self._n]
+        self._n -= 1
+
+    def __iter__(self):
+        for i in range(self._n):
+            yield OrderView(self, i)
+
+    def __eq__(self, other):
+        """Equal to *Orders* or a list of order dicts or *Order* objects
+        with same days, volumes and prices.
+        """
+        if not isinstance(other, (Orders, list)):
+            return NotImplemented
+        return self.to_records() == as_orders(other).to_records()
+
+    def __repr__(self):
+        return f"Orders(<{len(self)} orders>)"
+
+    def columns(self):
+        """Day, volume and price as lists of Python numbers."""
+        return self.day.tolist(), self.volume.tolist(), self.price.tolist()
+
+    def reserve(self, capacity: int):
+        """Allocate arrays for at least *capacity* orders."""
+        if capacity > self.capacity:
+            for name in ("_day", "_volume", "_price"):
+                x = getattr(self, name)
+                y = np.empty(capacity, dtype=x.dtype)
+                y[: self._n] = x[: self._n]
+                setattr(self, name, y)
+
+    def append(self, day: int, volume: float, price: float):
+        if self._n == self.capacity:
+            self.reserve(max(8, 2 * self.capacity))
+        i = self._n
+        self._day[i] = _order_days(day)[0]
+        self._volume[i], self._price[i] = volume, price
+        self._n += 1
+
+    def copy(self) -> "Orders":
+        """Orders with own arrays."""
+        return Orders(self.day.copy(), self.volume.copy(), self.price.copy())
+
+    def take(self, ix):
+        """Orders at positions, slice or boolean mask *ix*."""
+        return Orders(self.day[ix], self.volume[ix], self.price[ix])
+
+    def to_records(self) -> List[Dict]:
+        return [dict(day=d, volume=v, price=p) for d, v, p in zip(*self.columns())]
+
+
+def _order_days(day) -> np.ndarray:
+    """Order days as int32 array. Raises ValueError for negative or
+    non-integral days instead of truncating them.
+    """
+    day = np.asarray(day).reshape(-1)
+    with np.errstate(invalid="ignore"):
+        days = day.astype(np.int32)
+    bad = (days != day) | (days < 0)
+    if bad.any():
+        raise ValueError(f"Order day must be a non-negative integer, not {day[bad][0]}")
+    return days
+
+
+def _row(record):
+    if isinstance(record, dict):
+        return record["day"], record["volume"], record["price"]
+    return record.day, record.volume, record.price
+
+
+def as_orders(orders) -> Orders:
+    """Convert list of order dicts or *Order* objects to *Orders*."""
+    if isinstance(orders, Orders):
+        return orders
+    return Orders.from_records(orders)
+
+
+def _read_table(source) -> Dict[str, np.ndarray]:
+    import pandas as pd
+
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        suffixes = path.suffixes
+        if ".csv" in suffixes:
+            source = pd.read_csv(path, usecols=COLUMNS)
+        elif ".parquet" in suffixes:
+            source = pd.read_parquet(path, columns=COLUMNS)
+        else:
+            raise ValueError(f"Cannot read orders from {path}, use CSV or Parquet file")
+    if isinstance(source, pd.DataFrame):
+        return {k: source[k].to_numpy() for k in COLUMNS}
+    if isinstance(source, np.ndarray) and source.dtype.names:
+        return {k: source[k] for k in COLUMNS}
+    raise TypeError(f"Cannot read orders from {type(source).__name__}")
+
+
+def read_orders(source) -> Dict[str, Orders]:
+    """Read orders from *source* and split them by product.
+
+    *source* is a pandas dataframe, a NumPy structured array or a path
+    to CSV or Parquet file with columns product, day, volume and price.
+    Order of rows within each product is preserved.
+    """
+    import pandas as pd
+
+    table = _read_table(source)
+    codes, names = pd.factorize(table["product"])
+    order = np.argsort(codes, kind="stable")
+    bounds = np.cumsum(np.bincount(codes, minlength=len(names)))[:-1]
+    res = {}
+    for name, ix in zip(names, np.split(order, bounds)):
+        res[str(name)] = Orders(
+            table["day"][ix], table["volume"][ix], table["price"][ix]
+        )
+    return res
+
+
+def load_orders(products: List, source: Union[str, Path, object]) -> List:
+    """Set orders of *products* from *source*, see *read_orders*.
+    Products without orders in *source* get no orders.
+    """
+    orders = read_orders(source)
+    names = {p.name for p in products}
+    unknown = set(orders) - names
+    if unknown:
+        raise ValueError(f"Orders for unknown products: {sorted(unknown)}")
+    for p in products:
+        p.orders = orders.get(p.name, Orders())
+    return products
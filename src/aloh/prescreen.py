@@ -0,0 +1,170 @@
+"""Fix order acceptance before the MIP solve.
+
+*prescreen* fixes binary *Accept_* variables of an *OptModel* in three steps:
+
+1. orders priced below full unit cost, that is own unit cost plus cost
+   of all products it requires (full requirements, see *Materials.R*),
+   are rejected;
+2. orders that alone require more of some product than can be produced
+   up to the order day are rejected;
+3. LP relaxation of the model is solved and orders whose reduced costs
+   show they cannot change in a solution better than a known one
+   are fixed (reduced cost fixing, CBC only: highspy does not report
+   reduced costs to PuLP).
+
+Only the remaining orders are left as binaries for the MIP solver:
+
+    m = OptModel(products, "model", inventory_weight=0.1)
+    report = prescreen(m)
+    ac, xs = m.evaluate()
+
+Steps 2 and 3 keep the MIP optimum. Step 1 is a heuristic: an unprofitable
+order may still pay off if it lets stock be kept under a storage limit
+for other orders. Switch it off by *below_cost=False* for models with
+tight storage limits.
+"""
+
+from dataclasses import asdict, dataclass, field
+from time import perf_counter
+from typing import Dict
+
+import numpy as np  # type: ignore
+import pulp
+
+__all__ = ["PrescreenReport", "prescreen"]
+
+
+@dataclass
+class PrescreenReport:
+    """Number of orders fixed at each step and time spent."""
+
+    n_orders: int = 0
+    below_cost: int = 0
+    over_capacity: int = 0
+    lp_accepted: int = 0
+    lp_rejected: int = 0
+    seconds: float = 0
+    # fixed acceptance by product and order index
+    fixed: Dict[str, Dict[int, int]] = field(default_factory=dict)
+
+    @property
+    def eliminated(self) -> int:
+        """Binary variables fixed before the MIP solve."""
+        return sum(map(len, self.fixed.values()))
+
+    @property
+    def remaining(self) -> int:
+        return self.n_orders - self.eliminated
+
+    def as_dict(self) -> Dict:
+        res = asdict(self)
+        del res["fixed"]
+        return dict(res, eliminated=self.eliminated, remaining=self.remaining)
+
+
+def full_unit_costs(m) -> Dict[str, float]:
+    """Unit cost of product including products it requires."""
+    full_req = m.ms.full_requirements()
+    return {
+        p: sum(r * (m.unit_costs[p2] or 0) for p2, r in full_req[p].items())
+        for p in m.products
+    }
+
+
+def over_capacity(m) -> Dict[str, np.ndarray]:
+    """Masks of orders that need more of some product than its capacity
+    times the number of days up to the order day plus opening inventory.
+    """
+    full_req = m.ms.full_requirements()
+    res = {}
+    for p in m.products:
+        orders = m.order_dict[p]
+        mask = np.zeros(len(orders), dtype=bool)
+        for p2, r in full_req[p].items():
+            available = m.capacities[p2] * (orders.day + 1) + m.opening_inventory[p2]
+            mask |= r * orders.volume > available
+        res[p] = mask
+    return res
+
+
+def _fix(m, report: PrescreenReport, p: str, i: int, value: int):
+    a = m.accept_dict[p][i]
+    a.lowBound = a.upBound = value
+    report.fixed.setdefault(p, {})[i] = value
+
+
+def prescreen(
+    m, below_cost: bool = True, lp: bool = True, tol: float = 1e-6
+) -> PrescreenReport:
+    """Fix acceptance of orders of *m* before *m.evaluate()*.
+    *tol* is tolerance for LP relaxation values and objective comparison.
+    """
+    start = perf_counter()
+    report = PrescreenReport(n_orders=sum(map(len, m.order_dict.values())))
+    with m.timer.phase("prescreen") as ph:
+        costs = full_unit_costs(m)
+        too_large = over_capacity(m)
+        for p in m.products:
+            orders = m.order_dict[p]
+            for i in np.flatnonzero(too_large[p]).tolist():
+                _fix(m, report, p, i, 0)
+                report.over_capacity += 1
+            if below_cost:
+                cheap = (orders.price < costs[p]) & ~too_large[p]
+                for i in np.flatnonzero(cheap).tolist():
+                    _fix(m, report, p, i, 0)
+                    report.below_cost += 1
+        if lp:
+            _fix_by_lp_relaxation(m, report, tol)
+        ph.count = report.eliminated
+    report.seconds = perf_counter() - start
+    m.prescreen_report = report
+    m.report(
+        f"Prescreen fixed {report.eliminated} of {report.n_orders} orders "
+        f"in {report.seconds:.3f} sec"
+    )
+    return report
+
+
+def _solve(m, mip: bool):
+    m.model.solve(m.solver.make(mip=mip))
+    if m.model.status != pulp.LpStatusOptimal:
+        return None
+    return pulp.value(m.model.objective)
+
+
+def _fix_by_lp_relaxation(m, report: PrescreenReport, tol: float):
+    """Reduced cost fixing. An order at 0 in the LP relaxation optimum *z*
+    with reduced cost *dj* cannot be accepted in a solution better than
+    *z + dj*, if that is below a known solution value the order is rejected.
+    Orders at 1 are accepted by the same rule. The known solution is
+    the MIP optimum with orders integral in the relaxation fixed, so only
+    the few fractional orders are binaries.
+    """
+    m.build()
+    z = _solve(m, mip=False)
+    if z is None:
+        return
+    accept = [(p, i, a) for p in m.products for i, a in enumerate(m.accept_dict[p])]
+    lp = {a.name: (a.varValue, a.dj) for _, _, a in accept}
+    bounds = {a.name: (a.lowBound, a.upBound) for _, _, a in accept}
+    for _, _, a in accept:
+        if a.varValue >= 1 - tol:
+            a.lowBound = a.upBound = 1
+        elif a.varValue <= tol:
+            a.lowBound = a.upBound = 0
+    z_known = _solve(m, mip=True)
+    for _, _, a in accept:
+        a.lowBound, a.upBound = bounds[a.name]
+    if z_known is None:
+        return
+    for p, i, a in accept:
+        value, dj = lp[a.name]
+        if i in report.fixed.get(p, {}) or value is None or dj is None:
+            continue
+        if value <= tol and z + dj < z_known - tol:
+            _fix(m, report, p, i, 0)
+            report.lp_rejected += 1
+        elif value >= 1 - tol and z - dj < z_known - tol:
+            _fix(m, report, p, i, 1)
+            report.lp_accepted += 1
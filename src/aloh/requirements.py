@@ -1,13 +1,17 @@
 """Direct and full material requirements."""
 
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, List, Optional
 
 import numpy as np  # type: ignore
-import pandas as pd
+
+# Sparse matrix as adjacency list: {row: {column: value}}, zeros are omitted.
+SparseMatrix = Dict[str, Dict[str, float]]
 
 
 def as_dataframe(x, names):
+    import pandas as pd
+
     return pd.DataFrame(x, columns=names, index=names)
 
 
@@ -24,6 +28,56 @@ def calculate_full_requirement(B):
     return rounds(R)
 
 
+def to_dense(mat: SparseMatrix, names: List[str]) -> np.ndarray:
+    ix = {p: i for i, p in enumerate(names)}
+    arr = np.zeros((len(names), len(names)))
+    for p_i, row in mat.items():
+        for p_j, x in row.items():
+            arr[ix[p_i], ix[p_j]] = x
+    return arr
+
+
+def to_sparse(arr: np.ndarray, names: List[str]) -> SparseMatrix:
+    return {p: {p2: x for p2, x in zip(names, row) if x} for p, row in zip(names, arr)}
+
+
+def topological_order(requires: SparseMatrix) -> Optional[List[str]]:
+    """Order products so that every product follows the products it requires.
+    Returns None if requirements have a cycle.
+    """
+    n_inputs = {p: len(row) for p, row in requires.items()}
+    users: Dict[str, List[str]] = {p: [] for p in requires}
+    for p_i, row in requires.items():
+        for p_j in row:
+            users[p_j].append(p_i)
+    order = [p for p, n in n_inputs.items() if n == 0]
+    for p_j in order:
+        for p_i in users[p_j]:
+            n_inputs[p_i] -= 1
+            if n_inputs[p_i] == 0:
+                order.append(p_i)
+    if len(order) < len(requires):
+        return None
+    return order
+
+
+def propagate_full_requirement(
+    requires: SparseMatrix, order: List[str], eps=0.001
+) -> SparseMatrix:
+    """Full requirements for acyclic direct requirements:
+    R(i) = e(i) + sum_j B(i,j) * R(j), calculated in topological *order*.
+    """
+    R: SparseMatrix = {}
+    for p in order:
+        row = {p: 1.0}
+        for p_j, b in requires[p].items():
+            for p_k, r in R[p_j].items():
+                row[p_k] = row.get(p_k, 0) + b * r
+        R[p] = row
+    # small values are dropped after propagation, same as *rounds()*
+    return {p: {k: x for k, x in row.items() if abs(x) >= eps} for p, row in R.items()}
+
+
 @dataclass
 class Materials:
     product_names: List[str]
@@ -32,17 +86,67 @@ class Materials:
         """
         B - матрица прямых затрат.
         На производство единицы товара i необходимо B(i,j) единиц товара j.
+        Хранится как список смежности *requires*: {i: {j: B(i,j)}}.
         """
-        self.B = as_dataframe(0, self.product_names)
+        self.requires: SparseMatrix = {p: {} for p in self.product_names}
+        self._R: Optional[SparseMatrix] = None
+
+    @property
+    def B(self):
+        """Direct requirements as a new dataframe on every access, so changes
+        to it (``ms.B.loc[i, j] = x``) are not kept. Use *require* or assign
+        a whole matrix: ``ms.B = df``.
+        """
+        return as_dataframe(
+            to_dense(self.requires, self.product_names), self.product_names
+        )
+
+    @B.setter
+    def B(self, value):
+        """Set direct requirements from a dataframe labelled with product
+        names or from an array in order of *product_names*.
+        """
+        if hasattr(value, "loc"):
+            value = value.loc[self.product_names, self.product_names].to_numpy()
+        arr = np.asarray(value, dtype=float)
+        n = len(self.product_names)
+        if arr.shape != (n, n):
+            raise ValueError(f"Matrix B must have shape {(n, n)}, not {arr.shape}")
+        self.requires = to_sparse(arr, self.product_names)
+        self._R = None
 
     def require(self, p_i: str, x: float, p_j: str):
-        self.B.loc[p_i, p_j] = x
+        for p in p_i, p_j:
+            if p not in self.requires:
+                raise ValueError(f"Unknown product: {p}")
+        if x:
+            self.requires[p_i][p_j] = x
+        else:
+            self.requires[p_i].pop(p_j, None)
+        self._R = None
+
+    def is_acyclic(self) -> bool:
+        return topological_order(self.requires) is not None
+
+    def _full_requirements(self) -> SparseMatrix:
+        if self._R is None:
+            order = topological_order(self.requires)
+            if order is not None:
+                R = propagate_full_requirement(self.requires, order)
+                self._R = {p: R[p] for p in self.product_names}
+            else:
+                # cyclic requirements - use dense inverse
+                B = to_dense(self.requires, self.product_names)
+                R = calculate_full_requirement(B)
+                self._R = to_sparse(R, self.product_names)
+        return self._R
 
     def calculate_R(self):
         """
         R - матрица полных затрат.
+        Рассчитывается один раз и сбрасывается при изменении B.
         """
-        return calculate_full_requirement(self.B)
+        return to_dense(self._full_requirements(), self.product_names)
 
     @property
     def R(self):
@@ -52,12 +156,19 @@ class Materials:
         """Предоставить функцию, которая будет рассчитывать
         полные потребности в продуктах для продукта *p*.
         """
+        R = self.calculate_R()
 
         def req(p: str):
-            return g(p, self.product_names, self.calculate_R())
+            return g(p, self.product_names, R)
 
         return req
 
+    def full_requirements(self) -> SparseMatrix:
+        """Ненулевые полные потребности для каждого продукта:
+        {p: {p2: R(p, p2)}}.
+        """
+        return {p: dict(row) for p, row in self._full_requirements().items()}
+
 
 def g(product: str, products: List[str], R: np.ndarray):
     xs = [(1 if (p == product) else 0) for p in products]
@@ -0,0 +1,151 @@
+"""Rolling horizon planning for long order books.
+
+Instead of one model over all days, *RollingHorizon* solves a model
+for a window of *window* days, fixes production and order decisions
+for the first *step* days, carries inventory at the end of the last
+fixed day forward and slides the window by *step* days. Orders seen
+in the window limit the stock, so with *step* equal to *window* no
+inventory is carried over. Orders beyond the window are not
+visible to the model, so the result may be worse than the full horizon
+optimum, but each model is small.
+"""
+
+from dataclasses import replace
+from time import perf_counter
+from typing import Dict, List
+
+import numpy as np  # type: ignore
+import pulp
+
+from aloh.interface import Product
+from aloh.orders import Orders, as_orders
+from aloh.small import OptModel
+from aloh.solvers import SolverSettings
+
+__all__ = ["RollingHorizon"]
+
+
+class WindowModel(OptModel):
+    """Model for one window: starts with opening inventory and has no
+    closed sum constraint. The storage limit still applies: stock is kept
+    only for requirements inside the window, so inventory on the last day
+    of the window is zero. Stock is carried to the next window only from
+    a day before the window end, that is when step is less than window.
+    """
+
+    def __init__(
+        self,
+        products: List[Product],
+        model_name: str,
+        inventory_weight: float,
+        horizon: int,
+        opening_inventory: Dict[str, float],
+    ):
+        super().__init__(products, model_name, inventory_weight, horizon=horizon)
+        self.opening_inventory = dict(opening_inventory)
+
+    def set_closed_sum(self):
+        pass
+
+
+def window_products(products: List[Product], start: int, end: int):
+    """Copy *products* with orders for days from *start* to *end* (exclusive),
+    order days are shifted to start from zero. Also returns original
+    order indices.
+    """
+    res, positions = [], {}
+    for p in products:
+        orders = as_orders(p.orders)
+        ix = np.flatnonzero((orders.day >= start) & (orders.day < end))
+        window_orders = Orders(
+            orders.day[ix] - start, orders.volume[ix], orders.price[ix]
+        )
+        res.append(replace(p, orders=window_orders))
+        positions[p.name] = ix.tolist()
+    return res, positions
+
+
+class RollingHorizon:
+    def __init__(
+        self,
+        products: List[Product],
+        model_name: str,
+        inventory_weight: float,
+        window: int,
+        step: int,
+    ):
+        if not 0 < step <= window:
+            raise ValueError("Step must be positive and not larger than window")
+        self.products = products
+        self.model_name = model_name
+        self.inventory_weight = inventory_weight
+        self.window = window
+        self.step = step
+        self.solver = SolverSettings(msg=False)
+        self.orders = {p.name: as_orders(p.orders) for p in products}
+        self.n_days = 1 + max(int(x.day.max()) for x in self.orders.values() if len(x))
+        self.accept: Dict[str, List[int]] = {}
+        self.prod: Dict[str, List[float]] = {}
+        self.inv: Dict[str, List[float]] = {}
+        self.windows: List[Dict] = []
+        self.time_elapsed = 0
+
+    def evaluate(self):
+        start_time = perf_counter()
+        names = [p.name for p in self.products]
+        days = {p: self.orders[p].day for p in names}
+        self.accept = {p: [0] * len(self.orders[p]) for p in names}
+        self.prod = {p: [] for p in names}
+        self.inv = {p: [] for p in names}
+        opening = {p: 0 for p in names}
+        start = 0
+        while start < self.n_days:
+            length = min(self.window, self.n_days - start)
+            # the last window fixes all its days
+            fixed = length if start + length == self.n_days else self.step
+            products, positions = window_products(self.products, start, start + length)
+            m = WindowModel(
+                products,
+                f"{self.model_name}_{start}",
+                self.inventory_weight,
+                horizon=length,
+                opening_inventory=opening,
+            )
+            m.solver = self.solver
+            ac, xs = m.evaluate()
+            if m.solve_info["status"] != "Optimal":
+                raise RuntimeError(
+                    f"Window starting day {start}: {m.solve_info['status']}"
+                )
+            for p in names:
+                for k, i in enumerate(positions[p]):
+                    if days[p][i] < start + fixed:
+                        self.accept[p][i] = ac[p][k]
+                self.prod[p].extend(xs[p][:fixed])
+                inv = [pulp.value(m.inv[p][d]) for d in range(fixed)]
+                self.inv[p].extend(inv)
+                opening[p] = inv[-1]
+            self.windows.append(
+                dict(start=start, days=length, fixed=fixed, **m.solve_info)
+            )
+            start += fixed
+        self.time_elapsed = perf_counter() - start_time
+        return self.accepted_orders(), self.estimated_production()
+
+    def accepted_orders(self) -> Dict[str, List[int]]:
+        return self.accept
+
+    def estimated_production(self) -> Dict[str, List[float]]:
+        return self.prod
+
+    def objective_value(self) -> float:
+        """Sales less costs less weighted inventory of fixed decisions,
+        same as objective of the full horizon model.
+        """
+        res = 0
+        for p in self.products:
+            orders = self.orders[p.name]
+            res += float(np.sum(self.accept[p.name] * orders.volume * orders.price))
+            res -= p.unit_cost * sum(self.prod[p.name])
+            res -= self.inventory_weight * sum(self.inv[p.name])
+        return res
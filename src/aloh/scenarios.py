@@ -0,0 +1,122 @@
+"""Run the same order book under several parameter scenarios in parallel.
+
+Each scenario overrides *inventory_weight* and, optionally, capacities
+of some products. Scenarios are built and solved in a process pool,
+results are collected into one tidy dataframe.
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from aloh.interface import Product
+from aloh.small import OptModel
+from aloh.solvers import SolverSettings
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+__all__ = ["Scenario", "scenario_grid", "run_scenarios"]
+
+
+@dataclass
+class Scenario:
+    inventory_weight: float
+    capacities: Dict[str, float] = field(default_factory=dict)
+
+    def apply(self, products: List[Product]) -> List[Product]:
+        """Copy *products* with capacities of this scenario."""
+        return [
+            replace(p, capacity=self.capacities.get(p.name, p.capacity))
+            for p in products
+        ]
+
+
+def scenario_grid(
+    inventory_weights: Iterable[float], capacities: Iterable[Dict[str, float]] = ({},)
+) -> List[Scenario]:
+    """All combinations of *inventory_weights* and capacity overrides."""
+    return [
+        Scenario(w, dict(caps))
+        for w, caps in itertools.product(inventory_weights, capacities)
+    ]
+
+
+def worker_threads(
+    max_workers: int, solver_threads: Optional[int], n_cores: Optional[int] = None
+) -> int:
+    """Solver threads per worker, so that the total stays within *n_cores*."""
+    n_cores = n_cores or os.cpu_count() or 1
+    if solver_threads is None:
+        return max(1, n_cores // max_workers)
+    if solver_threads * max_workers > n_cores:
+        raise ValueError(
+            f"{max_workers} workers with {solver_threads} solver threads each "
+            f"exceed {n_cores} cores"
+        )
+    return solver_threads
+
+
+def run_scenario(
+    products: List[Product], scenario: Scenario, model_name: str, solver: SolverSettings
+) -> List[Dict]:
+    """Build and solve one scenario, return tidy rows."""
+    m = OptModel(scenario.apply(products), model_name, scenario.inventory_weight)
+    m.solver = solver
+    ac, xs = m.evaluate()
+    common = dict(
+        inventory_weight=scenario.inventory_weight,
+        objective=m.solve_info["objective"],
+        status=m.solve_info["status"],
+    )
+    rows = []
+    for p in m.products:
+        for variable, values in [("accept", ac[p]), ("production", xs[p])]:
+            for n, value in enumerate(values):
+                rows.append(
+                    dict(
+                        **common,
+                        capacity=m.capacities[p],
+                        product=p,
+                        variable=variable,
+                        n=n,
+                        value=value,
+                    )
+                )
+    return rows
+
+
+def run_scenarios(
+    products: List[Product],
+    scenarios: List[Scenario],
+    model_name: str = "scenario",
+    max_workers: Optional[int] = None,
+    solver_threads: Optional[int] = None,
+    solver: Optional[SolverSettings] = None,
+) -> "pd.DataFrame":
+    """Solve *scenarios* in a process pool of *max_workers*.
+
+    Each worker solver gets *solver_threads* threads, by default the number
+    of cores divided by the number of workers. Returns a dataframe with
+    one row per scenario, product, variable ("accept" for order *n*,
+    "production" for day *n*) and its value.
+    """
+    import pandas as pd
+
+    if not scenarios:
+        raise ValueError("No scenarios to run")
+    max_workers = max_workers or min(len(scenarios), os.cpu_count() or 1)
+    threads = worker_threads(max_workers, solver_threads)
+    solver = replace(solver or SolverSettings(msg=False), threads=threads)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(run_scenario, products, s, f"{model_name}_{i}", solver)
+            for i, s in enumerate(scenarios)
+        ]
+        results = [f.result() for f in futures]
+    dfs = [pd.DataFrame(rows).assign(scenario=i) for i, rows in enumerate(results)]
+    df = pd.concat(dfs, ignore_index=True)
+    columns = ["scenario", "inventory_weight", "objective", "status", "product"]
+    return df[columns + ["capacity", "variable", "n", "value"]]
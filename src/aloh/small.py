@@ -2,16 +2,24 @@
    This is the main module in 'aloh' package.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import wraps
 from time import perf_counter
-from typing import Dict, List
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
 
-import pandas as pd
+import numpy as np  # type: ignore
 import pulp
 
 import aloh.interface
+from aloh.cache import ResultCache, model_fingerprint
+from aloh.external import ExternalSolve, write_mps
 from aloh.interface import Product
 from aloh.requirements import Materials
+from aloh.solvers import SolverSettings
+from aloh.timing import Timer, logger
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 # This is a dict of dicts that mimics a matrix.
 # We need this data structure to work with pulp.
@@ -52,9 +60,23 @@ def values_to_list(mat: Matrix):
 
 
 def as_df(mat: Matrix):
+    import pandas as pd
+
     return pd.DataFrame(values(mat))
 
 
+def n_terms(mat: Matrix) -> int:
+    """Number of variables and expression terms in *mat*."""
+    res = 0
+    for p in mat.keys():
+        for x in mat[p].values():
+            if isinstance(x, pulp.LpAffineExpression):
+                res += len(x)
+            elif isinstance(x, pulp.LpVariable):
+                res += 1
+    return res
+
+
 # Orders
 
 
@@ -64,7 +86,7 @@ def make_accept_dict(order_dict):
     for p in order_dict.keys():
         accept[p] = [
             pulp.LpVariable(f"Accept_{p}_{i}", cat="Binary")
-            for i, order in enumerate(order_dict[p])
+            for i in range(len(order_dict[p]))
         ]
     return accept
 
@@ -105,12 +127,16 @@ class Dim:
         ship = self.empty_matrix()
         sales = self.empty_matrix()
         for p in self.products:
-            for i, order in enumerate(order_dict[p]):
-                for d in self.days:
-                    if order.day == d:
-                        a = accept_dict[p][i]
-                        ship[p][d] += a * order.volume
-                        sales[p][d] += a * order.volume * order.price
+            orders = aloh.interface.as_orders(order_dict[p])
+            for i, (d, volume, price) in enumerate(zip(*orders.columns())):
+                if d not in ship[p]:
+                    raise ValueError(
+                        f"Order {i} for product {p} has day {d} "
+                        f"outside of model days {self.days[0]}..{self.days[-1]}"
+                    )
+                a = accept_dict[p][i]
+                ship[p][d] += a * volume
+                sales[p][d] += a * volume * price
         return ship, sales
 
     def make_requirements(self, ship, ms: Materials):
@@ -121,23 +147,48 @@ class Dim:
         # Assumption: all needed products will be produced on the same day.
         #
         req = self.empty_matrix()
-        f = ms.requirements_factory()
+        # non-zero full requirements for each product, calculated once
+        full_req = ms.full_requirements()
         # iterate over all products
         for p in self.products:
-            # get full requirements for particular product
-            req_dict = f(p)
             # iterate over days
             for d in self.days:
                 # transmit requirements for each product
-                for p2, r in req_dict.items():
-                    # if requirement is zero - do nothing
-                    if r:
-                        req[p2][d] += r * ship[p][d]
+                for p2, r in full_req[p].items():
+                    req[p2][d] += r * ship[p][d]
         return req
 
+    def make_inventory(self):
+        """Create a decision variable for inventory:
+        inv[p][d] >= 0, where p is product and d is day.
+        The variables are linked to production and use by
+        stock balance constraints (see *OptModel.set_inventory_balance*).
+        """
+        inv = self.empty_matrix()
+        for p in self.products:
+            for d in self.days:
+                inv[p][d] = pulp.LpVariable(f"Inv_{p}_{d}", lowBound=0)
+        return inv
+
+    def make_cumulative_requirement(self):
+        """Create a decision variable for cumulative use:
+        cum_req[p][d] = req[p][0] + ... + req[p][d], the equality is set by
+        *OptModel.set_storage_limit*. Use over days d+1..e is then
+        cum_req[p][e] - cum_req[p][d], an expression of two terms.
+        """
+        cum_req = self.empty_matrix()
+        for p in self.products:
+            for d in self.days:
+                cum_req[p][d] = pulp.LpVariable(f"Cumreq_{p}_{d}", lowBound=0)
+        return cum_req
+
     def calculate_inventory(self, prod, use):
         """Create expressions for inventory.
         Inventory is end of day stock of produced, but not shipped goods.
+
+        Each expression holds all production and use terms up to day *d*,
+        so the model size grows as O(days²). Kept for comparison with
+        the stock balance formulation (see *Dim.make_inventory*).
         """
         inv = self.empty_matrix()
         for p in self.products:
@@ -156,97 +207,404 @@ def clean(s: str):
     return s.replace(" ", "_").replace(",", "_")
 
 
+# lazy attributes of OptModel and stages that create them
+LAZY_ATTRIBUTES = dict(
+    accept_dict="variables",
+    prod="variables",
+    costs="variables",
+    ship="shipment_sales",
+    sales="shipment_sales",
+    req="requirements",
+    inv="inventory",
+    cum_req="inventory",
+)
+
+
+def timed_constraints(method):
+    """Record time and number of constraints added by *method*."""
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.timer.phase(method.__name__) as ph:
+            n = len(self.model.constraints)
+            res = method(self, *args, **kwargs)
+            ph.count = len(self.model.constraints) - n
+        return res
+
+    return wrapper
+
+
+INVENTORY_FORMULATIONS = ["balance", "cumulative"]
+
+
 class OptModel:
+    # report with "aloh" logger instead of print
+    use_logging = False
+
     def __init__(
-        self, products: List[Product], model_name: str, inventory_weight: float
+        self,
+        products: List[Product],
+        model_name: str,
+        inventory_weight: float,
+        inventory: str = "balance",
+        horizon: Optional[int] = None,
     ):
+        """
+        *inventory* selects how end of day stocks are modelled:
+        - "balance": stock variables linked day to day by
+          inv[d] = inv[d-1] + prod[d] - req[d], model size is linear in days;
+        - "cumulative": stock is an expression of cumulative production
+          minus cumulative use, model size is quadratic in days.
+        Both formulations have the same optimum.
+
+        *horizon* is the number of days in the model, by default it lasts
+        until the day of the last order.
+        """
+        if inventory not in INVENTORY_FORMULATIONS:
+            raise ValueError(
+                f"Unknown inventory formulation: {inventory}, "
+                f"use one of {INVENTORY_FORMULATIONS}"
+            )
         # model parameters
         self.inventory_weight = inventory_weight
+        self.inventory = inventory
+        self.solver = SolverSettings()
+        # ExternalSolve options, solve in a child process if not None
+        self.external: Optional[Dict] = None
+        self.job: Optional[ExternalSolve] = None
+        self.cache: Optional[ResultCache] = None
+        # set by *aloh.prescreen.prescreen*
+        self.prescreen_report = None
+        self.solve_info: Dict = {}
         self.time_elapsed = 0
+        self.timer = Timer()
 
         #  plant and order parameters
         self.products = aloh.interface.names(products)
         self.capacities = aloh.interface.capacities(products)
         self.unit_costs = aloh.interface.unit_costs(products)
         self.order_dict = aloh.interface.order_dict(products)
-        self.days = aloh.interface.days(self.order_dict)
+        if horizon is None:
+            self.days = aloh.interface.days(self.order_dict)
+        else:
+            self.days = list(range(horizon))
+        # stock at start of first day, used with "balance" inventory
+        self.opening_inventory = {p: 0 for p in self.products}
         self.storage_days = aloh.interface.storage_days(
             products, max_allowed_storage_days=self.n_days
         )
 
-        # LP model
-        self.accept_dict = make_accept_dict(self.order_dict)
-        dim = Dim(self.products, self.days)
-        self.prod = dim.make_production(self.capacities)
-        self.costs = multiply(self.unit_costs, self.prod)
-        self.ship, self.sales = dim.make_shipment_sales(
-            self.order_dict, self.accept_dict
-        )
         self.ms = aloh.interface.get_materials(products)
-        self.req = dim.make_requirements(self.ship, self.ms)
-        self.inv = dim.calculate_inventory(self.prod, self.req)
+        self.dim = Dim(self.products, self.days)
+        # solution loaded from cache, see *load_result*
+        self.loaded: Optional[Dict] = None
         self.model = pulp.LpProblem(clean(model_name), pulp.LpMaximize)
+        self.is_built = False
+        # incremented when orders change after the model is created
+        self.revision = 0
 
     @property
     def n_days(self):
         return self.days[-1] + 1
 
+    # LP variables and expressions are created on first access,
+    # in stages that follow the order of dependencies
+
+    def __getattr__(self, name: str):
+        stage = LAZY_ATTRIBUTES.get(name)
+        if stage is None:
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            )
+        getattr(self, "_make_" + stage)()
+        return self.__dict__[name]
+
+    def make_expressions(self):
+        """Create all LP variables and expressions, if not created yet."""
+        for name in LAZY_ATTRIBUTES:
+            getattr(self, name)
+
+    def _make_variables(self):
+        with self.timer.phase("variables") as ph:
+            self.accept_dict = make_accept_dict(self.order_dict)
+            self.prod = self.dim.make_production(self.capacities)
+            self.costs = multiply(self.unit_costs, self.prod)
+            ph.count = n_terms(self.prod) + sum(map(len, self.accept_dict.values()))
+        self._set_loaded_values()
+
+    # dependencies are resolved before the phase starts,
+    # so that each phase times only its own stage
+
+    def _make_shipment_sales(self):
+        accept_dict = self.accept_dict
+        with self.timer.phase("shipment_sales") as ph:
+            self.ship, self.sales = self.dim.make_shipment_sales(
+                self.order_dict, accept_dict
+            )
+            ph.count = n_terms(self.ship) + n_terms(self.sales)
+
+    def _make_requirements(self):
+        ship = self.ship
+        with self.timer.phase("requirements") as ph:
+            self.req = self.dim.make_requirements(ship, self.ms)
+            ph.count = n_terms(self.req)
+
+    def _make_inventory(self):
+        prod, req = self.prod, self.req
+        with self.timer.phase("inventory") as ph:
+            if self.inventory == "balance":
+                self.inv = self.dim.make_inventory()
+            else:
+                self.inv = self.dim.calculate_inventory(prod, req)
+            self.cum_req = self.dim.make_cumulative_requirement()
+            ph.count = n_terms(self.inv) + n_terms(self.cum_req)
+        self._set_loaded_values()
+
+    def report(self, message: str):
+        if self.use_logging:
+            logger.info(message)
+        else:
+            print(message)
+
+    def timings(self):
+        """Wall time and object counts for model build and solve phases."""
+        return self.timer.dataframe()
+
     def set_objective(self):
         # Целевая функция
-        self.model += (
-            lp_sum(self.sales)
-            - lp_sum(self.costs)
-            - lp_sum(self.inv) * self.inventory_weight
-        )
+        with self.timer.phase("objective") as ph:
+            self.model += (
+                lp_sum(self.sales)
+                - lp_sum(self.costs)
+                - lp_sum(self.inv) * self.inventory_weight
+            )
+            ph.count = len(self.model.objective)
+
+    @timed_constraints
+    def set_inventory_balance(self):
+        """Ограничение: баланс запасов inv[d] = inv[d-1] + prod[d] - req[d].
 
+        Обязательно при inventory="balance": без него запасы Inv_* ничем
+        не ограничены. Все ограничения задает метод build().
+        """
+        if self.inventory != "balance":
+            return
+        for p in self.products:
+            for d in self.days:
+                prev = self.inv[p][d - 1] if d > 0 else self.opening_inventory[p]
+                self.model += (
+                    self.inv[p][d] - prev - self.prod[p][d] + self.req[p][d] == 0,
+                    f"Inventory_balance_{p}_{d}",
+                )
+
+    @timed_constraints
     def set_non_negative_inventory(self):
         """Ограничение: неотрицательные запасы."""
+        if self.inventory == "balance":
+            # Inv_* variables are already bounded from below by zero
+            return
         for p in self.products:
             for d in self.days:
                 self.model += (self.inv[p][d] >= 0, f"Non_negative_inventory_{p}_{d}")
 
+    @timed_constraints
     def set_closed_sum(self):
         """Ограничение: закрытая сумма, нулевые входящие и исходящие остатки."""
         for p in self.products:
             self.model += (
-                pulp.lpSum(self.prod[p]) == pulp.lpSum(self.req[p]),
+                pulp.lpSum(self.prod[p]) + self.opening_inventory[p]
+                == pulp.lpSum(self.req[p]),
                 f"Closed sum for {p}",
             )
 
+    @timed_constraints
     def set_storage_limit(self):
-        """Ввести ограничение на срок складирования продукта."""
+        """Ограничение на срок хранения: запас не больше использования
+        продукта за следующие s дней, inv[d] <= req[d+1] + ... + req[d+s].
+
+        Сумма считается через накопленное использование cum_req, поэтому
+        размер ограничения не зависит от срока хранения s.
+        """
+        last = self.days[-1]
         for p in self.products:
             s = self.storage_days[p]
+            cum = self.cum_req[p]
+            for d in self.days:
+                prev = cum[d - 1] if d > 0 else 0
+                self.model += (
+                    cum[d] - prev - self.req[p][d] == 0,
+                    f"Cumulative_requirement_{p}_{d}",
+                )
             for d in self.days:
-                xs = next_use(self.ship[p], d, s)
-                self.model += self.inv[p][d] <= pulp.lpSum(xs)
+                end = min(last, d + s)
+                if end == d:
+                    limit = 0
+                else:
+                    limit = cum[end] - cum[d]
+                self.model += (self.inv[p][d] <= limit, f"Storage_limit_{p}_{d}")
 
     def evaluate(self):
-        self.set_objective()
-        self.set_non_negative_inventory()
-        self.set_closed_sum()
-        self.set_storage_limit()
+        key, hit = self.from_cache()
+        if hit:
+            return self.accepted_orders(), self.estimated_production()
+        self.build()
         self.solve()
-        return self.accepted_orders(), self.estimated_production()
+        return self.extract_result(key)
+
+    def from_cache(self):
+        """Load result from cache, if set. Returns cache key (None without
+        cache) and True if the result was found.
+        """
+        if self.cache is None:
+            return None, False
+        with self.timer.phase("cache") as ph:
+            key = self.fingerprint()
+            result = self.cache.get(key)
+            ph.count = int(result is not None)
+        if result is not None:
+            self.load_result(result)
+        return key, result is not None
+
+    def extract_result(self, key: Optional[str] = None):
+        """Accepted orders and production of a solved model, result is
+        stored in cache under *key* if given.
+        """
+        with self.timer.phase("result_extraction") as ph:
+            ac, xs = self.accepted_orders(), self.estimated_production()
+            ph.count = sum(map(len, ac.values())) + sum(map(len, xs.values()))
+        if key is not None and self.solve_info["status"] == "Optimal":
+            self.cache.put(key, self.result())
+        return ac, xs
+
+    def build(self):
+        """Set objective and constraints, once."""
+        if not self.is_built:
+            self.make_expressions()
+            self.set_objective()
+            self.set_inventory_balance()
+            self.set_non_negative_inventory()
+            self.set_closed_sum()
+            self.set_storage_limit()
+            self.is_built = True
+
+    def use_cache(self, cache: ResultCache):
+        """Reuse results of models with same inputs, see *aloh.cache*."""
+        self.cache = cache
+        return self
+
+    def fingerprint(self) -> str:
+        return model_fingerprint(self)
+
+    def result(self) -> Dict:
+        """Solution values and solve information of a solved model."""
+        return dict(
+            accepted_orders=self.accepted_orders(),
+            production=self.estimated_production(),
+            inventory=values_to_list(self.inv),
+            solve_info=self.solve_info,
+        )
+
+    def load_result(self, result: Dict):
+        """Use *result* as solution without solving the model. Variables,
+        when created, get values from *result*, so that expressions and
+        *DataframeViewer* show the loaded solution.
+        """
+        self.loaded = result
+        self.solve_info = dict(result["solve_info"], cached=True)
+        self._set_loaded_values()
+
+    def _set_loaded_values(self):
+        result, built = self.loaded, self.__dict__
+        if result is None:
+            return
+        for p in self.products:
+            if "accept_dict" in built:
+                for a, x in zip(self.accept_dict[p], result["accepted_orders"][p]):
+                    a.varValue = x
+                for d in self.days:
+                    self.prod[p][d].varValue = result["production"][p][d]
+            if "inv" in built and self.inventory == "balance":
+                for d in self.days:
+                    self.inv[p][d].varValue = result["inventory"][p][d]
+
+    def use_solver(
+        self,
+        name: str = "CBC",
+        threads: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        gap: Optional[float] = None,
+        presolve: Optional[bool] = None,
+        msg: bool = True,
+    ):
+        """Select solver (CBC or HiGHS) and its options, see *SolverSettings*."""
+        self.solver = SolverSettings(name, threads, time_limit, gap, presolve, msg)
+        return self
+
+    def use_external_solver(
+        self,
+        on_line: Optional[Callable[[str], None]] = None,
+        timeout: Optional[float] = None,
+        workdir: Optional[str] = None,
+    ):
+        """Solve in a child process with streamed log, see *ExternalSolve*.
+        A running solve is stopped with *cancel*.
+        """
+        self.external = dict(on_line=on_line, timeout=timeout, workdir=workdir)
+        return self
+
+    def cancel(self):
+        """Kill the solver process of a running external solve."""
+        if self.job is not None:
+            self.job.cancel()
 
     def solve(self):
-        start = perf_counter()
-        self.model.solve()
-        self.time_elapsed = perf_counter() - start
-        print("Solved in {:.3f} sec".format(self.time_elapsed))
+        if self.external is None:
+            self.run_solver(lambda: self.model.solve(self.solver.make()))
+        else:
+            self.job = ExternalSolve(self.model, self.solver, **self.external)
+            self.run_solver(self.job.run)
+
+    def run_solver(self, run: Callable):
+        """Call *run* to solve the model, time it and set *solve_info*."""
+        self.loaded = None
+        with self.timer.phase("solver") as ph:
+            start = perf_counter()
+            run()
+            self.time_elapsed = perf_counter() - start
+            ph.count = self.model.numVariables()
+        self.set_solve_info()
+
+    def set_solve_info(self):
+        self.solve_info = dict(
+            solver=self.solver.as_dict(),
+            status=pulp.LpStatus[self.model.status],
+            objective=pulp.value(self.model.objective),
+            time_elapsed=self.time_elapsed,
+        )
+        self.report("Solved in {:.3f} sec".format(self.time_elapsed))
 
     def estimated_production(self):
+        if self.loaded is not None:
+            return {p: list(xs) for p, xs in self.loaded["production"].items()}
         return values_to_list(self.prod)
 
     def accepted_orders(self) -> Dict[str, int]:
+        if self.loaded is not None:
+            return {p: list(xs) for p, xs in self.loaded["accepted_orders"].items()}
         return {p: [as_int(x) for x in self.accept_dict[p]] for p in self.products}
 
     def accepted_orders_full(self):
         return accepted_orders_full(self)
 
-    def save(self, filename: str):
-        self.model.writeLP(filename)
-        print(f"Cохранили модель в файл {filename}")
+    def save(self, filename: str, fixed: bool = False):
+        """Save model to LP file or, if *filename* ends with ".mps" or
+        ".mps.gz", to MPS file (free or *fixed* format, see *write_mps*).
+        """
+        if filename.endswith((".mps", ".mps.gz")):
+            write_mps(self.model, filename, fixed=fixed)
+        else:
+            self.model.writeLP(filename)
+        self.report(f"Cохранили модель в файл {filename}")
 
 
 def as_int(x):
@@ -256,91 +614,140 @@ def as_int(x):
         return 0
 
 
-def next_use(xs, d, s):
-    """Slice *xs* list between *d* and *d+s* properly."""
-    if s == 0:
-        return 0
-    else:
-        last = len(xs) - 1
-        up_to = min(last, d + s) + 1
-        return [xs[t] for t in range(d + 1, up_to)]
-
-
 # Data frame functions - report what is inside model
 
 
 def accepted_orders_full(m: OptModel):
     def accepted_entry(p, m):
         return [
-            dict(order=d.__dict__, accepted=as_int(a))
-            for a, d in zip(m.accept_dict[p], m.order_dict[p])
+            dict(order=x, accepted=as_int(a))
+            for a, x in zip(m.accept_dict[p], m.order_dict[p].to_records())
         ]
 
     return {p: accepted_entry(p, m) for p in m.products}
 
 
-def orders_dataframe(p: str, m: OptModel):
-    df = pd.DataFrame(m.order_dict[p])
-    df["accept"] = m.accepted_orders()[p]
-    df.index.name = "n"
+def orders_table(m: OptModel) -> "pd.DataFrame":
+    """All orders with acceptance flags in one table with columns
+    product, n (order number within product), day, volume, price, accept.
+    """
+    import pandas as pd
+
+    accepted = m.accepted_orders()
+    orders = [m.order_dict[p] for p in m.products]
+    df = pd.DataFrame(
+        dict(
+            product=np.repeat(m.products, [len(x) for x in orders]),
+            n=np.concatenate([np.arange(len(x)) for x in orders]),
+            day=np.concatenate([x.day for x in orders]),
+            volume=np.concatenate([x.volume for x in orders]),
+            price=np.concatenate([x.price for x in orders]),
+        )
+    )
+    df["accept"] = [a for p in m.products for a in accepted[p]]
+    return df
+
+
+def orders_dataframe(p: str, m: OptModel, table=None):
+    table = orders_table(m) if table is None else table
+    df = table[table["product"] == p].drop(columns="product").set_index("n")
     return df
 
 
-def series(var, p: str):
-    return values(var)[p].values()
+# Model matrices shown in dataframes, in order of *variable_dataframes*
+SOLUTION_KEYS = ["prod", "ship", "req", "inv", "sales", "costs"]
 
 
-def product_dataframe(p: str, m: OptModel):
+def solution_arrays(m: OptModel) -> Dict[str, np.ndarray]:
+    """Evaluate model variables and expressions once after solve.
+    Returns arrays of shape (products, days) for each of *SOLUTION_KEYS*.
+    """
+    res = {}
+    for key in SOLUTION_KEYS:
+        mat = getattr(m, key)
+        res[key] = np.array(
+            [[pulp.value(x) for x in mat[p].values()] for p in m.products],
+            dtype=float,
+        )
+    return res
+
+
+def product_dataframe(p: str, m: OptModel, arrays=None):
+    import pandas as pd
+
+    arrays = arrays or solution_arrays(m)
+    i = m.products.index(p)
     df = pd.DataFrame()
-    df["x"] = series(m.prod, p)
-    df["ship"] = series(m.ship, p)
-    df["req"] = series(m.req, p)
-    df["inv"] = series(m.inv, p)
-    df["sales"] = series(m.sales, p)
-    df["costs"] = series(m.costs, p)
+    df["x"] = arrays["prod"][i]
+    for key in ["ship", "req", "inv", "sales", "costs"]:
+        df[key] = arrays[key][i]
     df.index.name = "day"
     return df
 
 
-def variable_dataframes(m: OptModel):
-    keys = ["prod", "ship", "req", "inv", "sales", "costs"]
-    return [as_df(m.__getattribute__(key)) for key in keys]
+def variable_dataframes(m: OptModel, arrays=None):
+    import pandas as pd
+
+    arrays = arrays or solution_arrays(m)
+    return [
+        pd.DataFrame(arrays[key].T, columns=m.products, index=m.days)
+        for key in SOLUTION_KEYS
+    ]
 
 
 @dataclass
 class DataframeViewer:
     om: OptModel
+    _arrays: Dict = field(default=None, init=False, repr=False)
+    _orders: "pd.DataFrame" = field(default=None, init=False, repr=False)
+    _solve_info: Dict = field(default=None, init=False, repr=False)
+    _revision: int = field(default=None, init=False, repr=False)
+
+    def _refresh(self):
+        """Evaluate solution again after a solve or a change of orders."""
+        om = self.om
+        if self._solve_info is not om.solve_info or self._revision != om.revision:
+            self._arrays = solution_arrays(om)
+            self._orders = orders_table(om)
+            self._solve_info = om.solve_info
+            self._revision = om.revision
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Solution values, evaluated once per solve of the model."""
+        self._refresh()
+        return self._arrays
+
+    def orders_table(self) -> "pd.DataFrame":
+        """Orders of all products, built once per solve of the model."""
+        self._refresh()
+        return self._orders
 
     def orders_dataframe(self, p: str):
-        return orders_dataframe(p, self.om)
+        return orders_dataframe(p, self.om, self.orders_table())
 
     def orders_dataframes(self):
-        return {p: orders_dataframe(p, self.om) for p in self.om.products}
+        return {p: self.orders_dataframe(p) for p in self.om.products}
 
     def orders_summary(self):
-        res = pd.DataFrame()
-        for k, v in self.orders_dataframes().items():
-            v["product"] = k
-            res = pd.concat([res, v], axis=0)
         return (
-            res.groupby(["day", "product"])
-            .sum()
-            .reset_index()
-            .pivot(index="day", values="volume", columns="product")
+            self.orders_table()
+            .pivot_table(index="day", columns="product", values="volume", aggfunc="sum")
             .fillna(0)
         )
 
     def product_dataframe(self, p: str):
-        return product_dataframe(p, self.om)
+        return product_dataframe(p, self.om, self.arrays())
 
     def product_dataframes(self):
-        return {p: product_dataframe(p, self.om) for p in self.om.products}
+        return {p: self.product_dataframe(p) for p in self.om.products}
 
     def inspect_variables(self):
-        return variable_dataframes(self.om)
+        return variable_dataframes(self.om, self.arrays())
 
     def summary_dataframe(self):
         """Объемы мощностей, заказов, производства, покупок (тонн)"""
+        import pandas as pd
+
         prod_df, ship_df, req_df, inv_df, sales_df, cost_df = self.inspect_variables()
         df = pd.DataFrame(
             {
@@ -0,0 +1,100 @@
+"""Solver selection: CBC or HiGHS with common settings."""
+
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+
+import pulp
+
+__all__ = ["SolverSettings", "SOLVER_NAMES", "available"]
+
+SOLVER_NAMES = ["CBC", "HiGHS"]
+
+
+@dataclass
+class SolverSettings:
+    """Solver name and options.
+
+    - *threads*: number of solver threads, solver default if None;
+    - *time_limit*: seconds, the best solution found so far is returned
+      when time is over;
+    - *gap*: relative MIP gap, solver stops when the solution is proven
+      to be within *gap* from the optimum;
+    - *presolve*: switch presolve on or off, solver default if None;
+    - *msg*: show solver log;
+    - *warm_start*: start from current variable values (CBC and
+      command line HiGHS only, ignored by highspy).
+    """
+
+    name: str = "CBC"
+    threads: Optional[int] = None
+    time_limit: Optional[float] = None
+    gap: Optional[float] = None
+    presolve: Optional[bool] = None
+    msg: bool = True
+    warm_start: bool = False
+
+    def __post_init__(self):
+        for name in SOLVER_NAMES:
+            if self.name.lower() == name.lower():
+                self.name = name
+                return
+        raise ValueError(f"Unknown solver: {self.name}, use one of {SOLVER_NAMES}")
+
+    def as_dict(self) -> Dict:
+        return asdict(self)
+
+    def make(self, mip: bool = True):
+        """Create PuLP solver object."""
+        if self.name == "CBC":
+            return pulp.PULP_CBC_CMD(
+                mip=mip,
+                msg=self.msg,
+                timeLimit=self.time_limit,
+                gapRel=self.gap,
+                threads=self.threads,
+                presolve=self.presolve,
+                warmStart=self.warm_start,
+            )
+        # HiGHS through highspy, with command line HiGHS as a fallback
+        kwargs = dict(
+            mip=mip,
+            msg=self.msg,
+            timeLimit=self.time_limit,
+            gapRel=self.gap,
+            threads=self.threads,
+        )
+        if hasattr(pulp, "HiGHS") and pulp.HiGHS().available():
+            if self.presolve is not None:
+                kwargs["presolve"] = "on" if self.presolve else "off"
+            return pulp.HiGHS(**kwargs)
+        if self.presolve is not None:
+            kwargs["options"] = ["presolve=" + ("on" if self.presolve else "off")]
+        solver = pulp.HiGHS_CMD(warmStart=self.warm_start, **kwargs)
+        if not solver.available():
+            raise RuntimeError("HiGHS is not available, try: pip install highspy")
+        return solver
+
+    def milp_options(self) -> Dict:
+        """Options for *scipy.optimize.milp*, which always uses HiGHS.
+        *threads* are not supported by scipy and are ignored.
+        """
+        if self.name != "HiGHS":
+            raise ValueError(f"scipy.optimize.milp uses HiGHS, not {self.name}")
+        options = dict(disp=self.msg)
+        if self.time_limit is not None:
+            options["time_limit"] = self.time_limit
+        if self.gap is not None:
+            options["mip_rel_gap"] = self.gap
+        if self.presolve is not None:
+            options["presolve"] = self.presolve
+        return options
+
+
+def available(name: str) -> bool:
+    """True if solver *name* can be used, HiGHS needs highspy
+    (``pip install aloh[highs]``) or HiGHS command line executable.
+    """
+    try:
+        return bool(SolverSettings(name, msg=False).make().available())
+    except RuntimeError:
+        return False
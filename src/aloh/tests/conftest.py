@@ -0,0 +1,50 @@
+import sys
+
+import pytest
+
+from aloh import Product
+from aloh.external import ExternalSolve
+
+
+def product_a():
+    pa = Product(name="A", capacity=10, unit_cost=0.2, storage_days=1)
+    pa.add_order(day=0, volume=7, price=0.3)
+    pa.add_order(day=0, volume=7, price=0.5)
+    pa.add_order(day=1, volume=9, price=0.1)
+    pa.add_order(day=2, volume=6, price=0.3)
+    pa.add_order(day=2, volume=6, price=0.3)
+    return pa
+
+
+@pytest.fixture
+def make_products():
+    """Factory for product A with five orders over three days,
+    each call returns new products.
+    """
+    return lambda: [product_a()]
+
+
+@pytest.fixture
+def make_products_ab():
+    """Factory for product A that requires B, both with orders."""
+
+    def make():
+        pa = product_a()
+        pa.requires = dict(B=0.5)
+        pb = Product(name="B", capacity=10, unit_cost=0.1, storage_days=2)
+        pb.add_order(day=1, volume=4, price=0.2)
+        pb.add_order(day=3, volume=9, price=0.3)
+        return [pa, pb]
+
+    return make
+
+
+def sleeper(self, mps_path, sol_path):
+    code = "import time; print('started', flush=True); time.sleep(30)"
+    return [sys.executable, "-c", code]
+
+
+@pytest.fixture
+def sleeping_solver(monkeypatch):
+    """External solver prints one line and sleeps instead of solving."""
+    monkeypatch.setattr(ExternalSolve, "command", sleeper)
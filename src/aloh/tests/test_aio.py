@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+import pytest
+
+from aloh import OptModel, Product
+from aloh.aio import AsyncSolve, aevaluate, aevaluate_model
+from aloh.external import SolveStopped
+from aloh.solvers import SolverSettings
+
+
+def model(products):
+    m = OptModel(products, model_name="model_0", inventory_weight=0.01)
+    m.use_solver(msg=False)
+    return m
+
+
+def test_aevaluate_same_as_evaluate(make_products):
+    m = model(make_products())
+    lines = []
+    ac, xs = asyncio.run(aevaluate_model(m, on_line=lines.append))
+    assert m.solve_info["status"] == "Optimal"
+    assert (ac, xs) == model(make_products()).evaluate()
+    assert any("Objective value" in line for line in lines)
+
+
+def test_concurrent_solves():
+    def products(k):
+        pa = Product(name="A", capacity=10 + k, unit_cost=0.2)
+        for d in range(3):
+            pa.add_order(day=d, volume=8, price=0.3)
+            pa.add_order(day=d, volume=5, price=0.2)
+        return [pa]
+
+    async def main():
+        solver = SolverSettings(msg=False)
+        jobs = [aevaluate(products(k), "model", 0.01, solver) for k in range(4)]
+        return await asyncio.gather(*jobs)
+
+    results = asyncio.run(main())
+    for k, res in enumerate(results):
+        m = OptModel(products(k), "model", 0.01).use_solver(msg=False)
+        assert res == m.evaluate()
+
+
+@pytest.mark.usefixtures("sleeping_solver")
+def test_aevaluate_timeout(make_products):
+    start = time.perf_counter()
+    with pytest.raises(SolveStopped, match="timed out"):
+        asyncio.run(aevaluate_model(model(make_products()), timeout=0.5))
+    assert time.perf_counter() - start < 10
+
+
+@pytest.mark.usefixtures("sleeping_solver")
+def test_aevaluate_cancel(make_products):
+    m = model(make_products())
+
+    async def main():
+        started = asyncio.Event()
+        task = asyncio.create_task(aevaluate_model(m, on_line=lambda _: started.set()))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert isinstance(m.job, AsyncSolve)
+    assert m.job.stopped == "cancelled"
+    assert m.job.process.returncode is not None
@@ -0,0 +1,71 @@
+import os
+import time
+
+import pytest
+
+from aloh import DataframeViewer, OptModel
+from aloh.cache import ResultCache
+
+
+def model(products, inventory_weight=0.01, cache=None):
+    m = OptModel(products, "cached", inventory_weight)
+    m.use_solver(msg=False)
+    if cache is not None:
+        m.use_cache(cache)
+    return m
+
+
+def test_fingerprint_changes_with_inputs(make_products_ab):
+    key = model(make_products_ab()).fingerprint()
+    assert model(make_products_ab()).fingerprint() == key
+    products = make_products_ab()
+    products[0].orders[1].price = 0.6
+    assert model(products).fingerprint() != key
+    assert model(make_products_ab(), inventory_weight=0.02).fingerprint() != key
+    products = make_products_ab()
+    products[0].requires = dict(B=0.4)
+    assert model(products).fingerprint() != key
+
+
+def test_cache_hit_does_not_solve(make_products_ab, tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path)
+    m1 = model(make_products_ab(), cache=cache)
+    ac, xs = m1.evaluate()
+    assert len(cache) == 1
+
+    def fail(self):
+        raise AssertionError("solved on cache hit")
+
+    monkeypatch.setattr(OptModel, "solve", fail)
+    m2 = model(make_products_ab(), cache=cache)
+    assert m2.evaluate() == (ac, xs)
+    assert m2.solve_info["cached"]
+    assert "accept_dict" not in m2.__dict__
+    assert m2.solve_info["objective"] == pytest.approx(m1.solve_info["objective"])
+    df1 = DataframeViewer(m1).product_dataframe("A")
+    df2 = DataframeViewer(m2).product_dataframe("A")
+    assert df2.equals(df1)
+
+
+def test_cache_evicts_by_size(tmp_path):
+    cache = ResultCache(tmp_path)
+    for i in range(5):
+        cache.put(f"key{i}", dict(x=list(range(20))))
+        # distinct modification times for least recently used order
+        os.utime(cache.path(f"key{i}"), (i, i))
+    cache.get("key1")
+    cache.max_bytes = sum(cache.path(k).stat().st_size for k in ["key1", "key4"])
+    cache.evict()
+    assert len(cache) == 2
+    assert cache.get("key1") is not None
+    assert cache.get("key4") is not None
+
+
+def test_cache_evicts_by_age(tmp_path):
+    cache = ResultCache(tmp_path, max_age=60)
+    cache.put("key", dict(x=1))
+    assert cache.get("key") == dict(x=1)
+    cache.max_age = 0
+    time.sleep(0.01)
+    assert cache.get("key") is None
+    assert len(cache) == 0
@@ -0,0 +1,138 @@
+import threading
+import time
+import urllib.error
+
+import pytest
+
+from aloh import OptModel
+from aloh.daemon import Client, Scheduler, job_dict, make_server, read_job
+from aloh.solvers import SolverSettings
+
+
+@pytest.fixture
+def job(make_products_ab):
+    def make(capacity=10, priority=0):
+        products = make_products_ab()
+        products[0].capacity = capacity
+        return job_dict(products, "model", 0.01, priority=priority)
+
+    return make
+
+
+@pytest.fixture
+def scheduler():
+    s = Scheduler(max_concurrent=1)
+    yield s
+    s.close()
+
+
+def test_read_job(make_products_ab, job):
+    spec = read_job(job())
+    assert spec["products"] == make_products_ab()
+    assert spec["solver"] == SolverSettings(msg=False)
+    with pytest.raises(ValueError):
+        read_job(dict(products=[dict(name="A", colour="red")], inventory_weight=1))
+    data = job()
+    data["products"][0]["requires"] = [1]
+    with pytest.raises(ValueError, match="mapping"):
+        read_job(data)
+    data = job()
+    data["products"][0]["orders"]["day"] = [-1, -1, -2, -2, -3]
+    with pytest.raises(ValueError, match="non-negative"):
+        read_job(data)
+
+
+def test_priority_and_coalescing(make_products_ab, job, scheduler):
+    # workers cannot take jobs while the lock is held
+    with scheduler._cond:
+        a = scheduler.submit(job(10))
+        b = scheduler.submit(job(11, priority=5))
+        c = scheduler.submit(job(12, priority=1))
+        assert scheduler.submit(job(12)) is c
+        d = scheduler.submit(job(13))
+        scheduler.cancel(d.id)
+    for j in (a, b, c):
+        scheduler.wait(j.id, timeout=30)
+    assert [j.status for j in (a, b, c, d)] == ["done"] * 3 + ["cancelled"]
+    assert b.started < c.started < a.started
+    assert c.requests == 2
+    assert d.started is None
+    m = OptModel(make_products_ab(), "model", 0.01).use_solver(msg=False)
+    ac, xs = m.evaluate()
+    assert a.result["accepted_orders"] == ac
+    assert a.result["production"] == xs
+    assert a.as_dict()["phases"]["solver"]["count"] > 0
+
+
+def test_http_service(job, scheduler):
+    server = make_server(scheduler, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = Client(f"http://127.0.0.1:{server.server_port}")
+        submitted = client.submit(job())
+        assert submitted["status"] in ("queued", "running")
+        res = client.wait(submitted["id"], timeout=30)
+        assert res["status"] == "done"
+        assert res["result"]["solve_info"]["status"] == "Optimal"
+        assert res["run_seconds"] > 0
+        with pytest.raises(urllib.error.HTTPError) as e:
+            client.status(999)
+        assert e.value.code == 404
+        with pytest.raises(urllib.error.HTTPError) as e:
+            client.submit(dict(products=[]))
+        assert e.value.code == 400
+        data = job()
+        data["products"][0]["requires"] = [1]
+        with pytest.raises(urllib.error.HTTPError) as e:
+            client.submit(data)
+        assert e.value.code == 400
+        scheduler.close()
+        with pytest.raises(urllib.error.HTTPError) as e:
+            client.submit(job())
+        assert e.value.code == 500
+        assert "closed" in e.value.read().decode()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_only_cbc_jobs(make_products_ab):
+    data = job_dict(make_products_ab(), "model", 0.01, SolverSettings("HiGHS"))
+    with pytest.raises(ValueError, match="CBC"):
+        read_job(data)
+
+
+def test_finished_job_releases_model(job, scheduler):
+    j = scheduler.wait(scheduler.submit(job()).id, timeout=30)
+    assert j.status == "done"
+    assert j.model is None
+    assert j.as_dict()["phases"]["solver"]["count"] > 0
+
+
+def test_cancel_before_solve(job, scheduler):
+    with scheduler._cond:
+        j = scheduler.submit(job())
+        build = j.model.build
+
+        def cancel_and_build():
+            scheduler.cancel(j.id)
+            build()
+
+        j.model.build = cancel_and_build
+    scheduler.wait(j.id, timeout=30)
+    assert j.status == "cancelled"
+    assert "solver" not in j.phases
+
+
+@pytest.mark.usefixtures("sleeping_solver")
+def test_close_kills_running_solver(job):
+    s = Scheduler(max_concurrent=1)
+    j = s.submit(job())
+    deadline = time.time() + 30
+    while j.model is not None and getattr(j.model.job, "process", None) is None:
+        assert time.time() < deadline
+        time.sleep(0.01)
+    process = j.model.job.process
+    s.close()
+    assert j.status == "cancelled"
+    assert process.poll() is not None
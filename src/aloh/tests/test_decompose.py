@@ -0,0 +1,62 @@
+import pytest
+
+from aloh import OptModel, Product
+from aloh.decompose import DecomposedModel, components, demanded_products
+
+
+def component_products():
+    pa = Product(name="A", capacity=10, unit_cost=0.2)
+    pa.add_order(day=0, volume=7, price=0.5)
+    pa.add_order(day=2, volume=12, price=0.6)
+    pa.requires = dict(B=0.5)
+    pb = Product(name="B", capacity=4, unit_cost=0.1)
+    pb.add_order(day=1, volume=5, price=0.3)
+    pb.requires = dict(C=2)
+    pc = Product(name="C", capacity=15, unit_cost=0.05)
+    pd = Product(name="D", capacity=5, unit_cost=0.3)
+    pd.add_order(day=4, volume=8, price=0.5)
+    pd.add_order(day=5, volume=9, price=0.4)
+    # no orders and not required
+    pe = Product(name="E", capacity=5, unit_cost=0.3)
+    pe.requires = dict(C=1)
+    return [pa, pb, pc, pd, pe]
+
+
+def test_components():
+    products = component_products()
+    assert demanded_products(products) == ["A", "B", "C", "D"]
+    assert components(products) == [["A", "B", "C"], ["D"]]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_decomposed_model_matches_full_model(max_workers):
+    m = OptModel(component_products(), "full", inventory_weight=0.01)
+    m.use_solver(msg=False)
+    ac, xs = m.evaluate()
+    dm = DecomposedModel(
+        component_products(), "split", inventory_weight=0.01, max_workers=max_workers
+    )
+    ac2, xs2 = dm.evaluate()
+    assert dm.solve_info["status"] == "Optimal"
+    assert len(dm.solve_info["components"]) == 2
+    assert dm.objective_value() == pytest.approx(m.solve_info["objective"])
+    assert ac2 == ac
+    assert xs2.keys() == xs.keys()
+    for p in xs:
+        assert xs2[p] == pytest.approx(xs[p])
+    assert xs2["E"] == [0] * 6
+
+
+def test_components_ignore_tiny_requirements():
+    pa = Product(name="A", capacity=10, unit_cost=0.2)
+    pa.add_order(day=0, volume=7, price=0.5)
+    pa.requires = dict(B=0.0005)
+    pb = Product(name="B", capacity=4, unit_cost=0.1)
+    assert components([pa, pb]) == [["A"]]
+
+
+def test_no_orders():
+    with pytest.raises(ValueError):
+        DecomposedModel([], "split", inventory_weight=0.01)
+    with pytest.raises(ValueError):
+        DecomposedModel([Product(name="A")], "split", inventory_weight=0.01)
@@ -0,0 +1,71 @@
+import gzip
+import time
+
+import pulp
+import pytest
+
+from aloh import OptModel
+from aloh.external import ExternalSolve, SolveStopped
+
+
+def evaluated(products, external=None):
+    m = OptModel(products, model_name="model_0", inventory_weight=0.01)
+    m.use_solver(msg=False)
+    if external is not None:
+        m.use_external_solver(**external)
+    m.evaluate()
+    return m
+
+
+def test_external_solve_same_as_in_process(make_products):
+    lines = []
+    m1 = evaluated(make_products())
+    m2 = evaluated(make_products(), dict(on_line=lines.append, timeout=60))
+    assert m2.solve_info["status"] == "Optimal"
+    assert m2.accepted_orders() == m1.accepted_orders()
+    assert m2.estimated_production() == m1.estimated_production()
+    assert any("Objective value" in line for line in lines)
+
+
+@pytest.mark.parametrize("filename", ["m.mps", "m.mps.gz"])
+@pytest.mark.parametrize("fixed", [False, True])
+def test_save_mps(make_products, tmp_path, filename, fixed):
+    m = evaluated(make_products())
+    path = tmp_path / filename
+    m.save(str(path), fixed=fixed)
+    if filename.endswith(".gz"):
+        with gzip.open(path, "rt") as f:
+            text = f.read()
+        path = tmp_path / "m.mps"
+        path.write_text(text)
+    _, m2 = pulp.LpProblem.fromMPS(str(path), sense=pulp.LpMaximize)
+    m2.solve(pulp.PULP_CBC_CMD(msg=False))
+    assert m2.objective.value() == pytest.approx(m.model.objective.value())
+
+
+@pytest.mark.usefixtures("sleeping_solver")
+def test_external_solve_timeout(make_products):
+    lines = []
+    m = OptModel(make_products(), model_name="model_0", inventory_weight=0.01)
+    m.use_external_solver(on_line=lines.append, timeout=0.5)
+    start = time.perf_counter()
+    with pytest.raises(SolveStopped, match="timed out"):
+        m.evaluate()
+    assert time.perf_counter() - start < 10
+    assert lines == ["started"]
+
+
+@pytest.mark.usefixtures("sleeping_solver")
+def test_external_solve_cancel(make_products):
+    m = OptModel(make_products(), model_name="model_0", inventory_weight=0.01)
+    m.use_external_solver(on_line=lambda line: m.cancel())
+    with pytest.raises(SolveStopped, match="cancelled"):
+        m.evaluate()
+    assert m.job.process.poll() is not None
+
+
+def test_external_solve_requires_cbc(make_products):
+    m = OptModel(make_products(), model_name="model_0", inventory_weight=0.01)
+    m.use_solver("HiGHS")
+    with pytest.raises(ValueError):
+        ExternalSolve(m.model, m.solver)
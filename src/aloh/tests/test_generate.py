@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from aloh import Product
+from aloh.generate import (Price, Volume, order_chunks, random_book,
+                           random_orders)
+
+pricer = Price(mean=100, delta=10)
+sizer = Volume(min_order=20, max_order=150, round_to=5)
+
+
+def test_random_orders_is_reproducible():
+    a = random_orders(30, 5000, pricer, sizer, seed=1)
+    b = random_orders(30, 5000, pricer, sizer, seed=1)
+    assert a == b
+    assert a != random_orders(30, 5000, pricer, sizer, seed=2)
+
+
+def test_random_orders():
+    orders = random_orders(30, 5000, pricer, sizer, seed=1)
+    assert orders.volume.sum() == pytest.approx(5000)
+    assert orders.day.min() >= 0 and orders.day.max() < 30
+    assert (orders.price >= 90).all() and (orders.price <= 110).all()
+    # sorted by day and price
+    key = orders.day * 1000 + orders.price
+    assert (np.diff(key) >= 0).all()
+
+
+def test_order_chunks():
+    chunks = list(order_chunks(30, 5000, pricer, sizer, seed=1, chunk_size=10))
+    assert all(len(c) <= 10 for c in chunks[:-1])
+    assert sum(c.volume.sum() for c in chunks) == pytest.approx(5000)
+    assert random_orders(30, 5000, pricer, sizer, seed=1, chunk_size=10) == (
+        random_orders(30, 5000, pricer, sizer, seed=1, chunk_size=10)
+    )
+
+
+def test_random_book():
+    products = [Product("A", capacity=100), Product("B", capacity=50)]
+    random_book(
+        products,
+        10,
+        pricer,
+        lambda p: Volume(0.1 * p.capacity, p.capacity),
+        1.5,
+        seed=0,
+    )
+    assert products[0].orders.volume.sum() == pytest.approx(1500)
+    assert products[1].orders.volume.sum() == pytest.approx(750)
+    with pytest.raises(ValueError):
+        random_book([Product("C")], 10, pricer, sizer)
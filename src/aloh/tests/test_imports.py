@@ -0,0 +1,41 @@
+import subprocess
+import sys
+
+import pytest
+
+import aloh
+
+
+def loaded(code: str):
+    check = (
+        "import sys; print(' '.join(m for m in ['pandas', 'pulp'] if m in sys.modules))"
+    )
+    res = subprocess.run(
+        [sys.executable, "-c", f"{code}\n{check}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return res.stdout.split("\n")[-2].split()
+
+
+def test_import_does_not_load_pandas_and_pulp():
+    code = "from aloh import Product, generate_orders, Price, Volume"
+    assert loaded(code) == []
+
+
+def test_model_does_not_load_pandas():
+    code = """
+from aloh import OptModel, Product
+p = Product("A", capacity=10, unit_cost=0.1)
+p.add_order(day=0, volume=5, price=1)
+m = OptModel([p], "model", inventory_weight=0.1).use_solver(msg=False)
+m.evaluate()
+"""
+    assert loaded(code) == ["pulp"]
+
+
+def test_lazy_names():
+    assert set(aloh.__all__) <= set(dir(aloh))
+    with pytest.raises(AttributeError):
+        aloh.Unknown
@@ -0,0 +1,100 @@
+import pytest
+
+from aloh import OptModel
+from aloh.incremental import IncrementalModel
+
+
+def cold(pa, pb):
+    m = OptModel([pa, pb], model_name="cold", inventory_weight=0.01)
+    m.use_solver(msg=False)
+    m.evaluate()
+    return m
+
+
+def warm(products):
+    m = IncrementalModel(products, model_name="warm", inventory_weight=0.01)
+    m.use_solver(msg=False)
+    m.evaluate()
+    return m
+
+
+def assert_same_objective(m1, m2):
+    assert m1.model.objective.value() == pytest.approx(m2.model.objective.value())
+
+
+def test_add_order(make_products_ab):
+    m = warm(make_products_ab())
+    assert m.add_order("B", day=2, volume=5, price=0.9) == 2
+    m.evaluate()
+    pa, pb = make_products_ab()
+    pb.add_order(day=2, volume=5, price=0.9)
+    m2 = cold(pa, pb)
+    assert_same_objective(m, m2)
+    assert m.accepted_orders() == m2.accepted_orders()
+    assert m.accepted_orders()["B"][2] == 1
+
+
+def test_remove_order(make_products_ab):
+    m = warm(make_products_ab())
+    assert m.accepted_orders()["A"][1] == 1
+    m.remove_order("A", 1)
+    m.evaluate()
+    pa, pb = make_products_ab()
+    del pa.orders[1]
+    assert_same_objective(m, cold(pa, pb))
+    assert m.accepted_orders()["A"][1] == 0
+
+
+def test_reprice_order(make_products_ab):
+    m = warm(make_products_ab())
+    m.reprice_order("A", 0, 0.6)
+    m.evaluate()
+    pa, pb = make_products_ab()
+    pa.orders[0]["price"] = 0.6
+    m2 = cold(pa, pb)
+    assert_same_objective(m, m2)
+    assert m.accepted_orders() == m2.accepted_orders()
+
+
+def test_add_order_before_build(make_products_ab):
+    m = IncrementalModel(make_products_ab(), model_name="warm", inventory_weight=0.01)
+    m.use_solver(msg=False)
+    assert m.add_order("B", day=2, volume=5, price=0.9) == 2
+    assert len(m.accept_dict["B"]) == len(m.order_dict["B"]) == 3
+    m.evaluate()
+    pa, pb = make_products_ab()
+    pb.add_order(day=2, volume=5, price=0.9)
+    assert_same_objective(m, cold(pa, pb))
+
+
+def test_add_order_outside_days(make_products_ab):
+    m = warm(make_products_ab())
+    with pytest.raises(ValueError):
+        m.add_order("A", day=10, volume=1, price=1)
+
+
+def test_edits_do_not_change_products(make_products_ab):
+    pa, pb = make_products_ab()
+    m = IncrementalModel([pa, pb], model_name="warm", inventory_weight=0.01)
+    m.use_solver(msg=False)
+    m.evaluate()
+    m.add_order("B", day=2, volume=5, price=0.9)
+    m.reprice_order("A", 0, 0.6)
+    assert len(pb.orders) == 2
+    assert pa.orders[0].price == 0.3
+    # later changes to products do not change the model
+    pa.add_order(day=1, volume=1, price=1)
+    assert len(m.order_dict["A"]) == len(m.accept_dict["A"]) == 5
+
+
+def test_viewer_follows_order_changes(make_products_ab):
+    from aloh import DataframeViewer
+
+    m = warm(make_products_ab())
+    viewer = DataframeViewer(m)
+    assert len(viewer.orders_table()) == 7
+    m.add_order("B", day=2, volume=5, price=0.9)
+    m.reprice_order("A", 0, 0.6)
+    table = viewer.orders_table()
+    assert len(table) == 8
+    assert table["price"].iloc[0] == 0.6
@@ -0,0 +1,41 @@
+import pytest
+
+from aloh.small import OptModel
+
+pytest.importorskip("scipy")
+
+from aloh.matrix import MatrixModel  # noqa: E402
+
+
+@pytest.mark.parametrize("storage_days", [0, 2])
+def test_matrix_model_matches_opt_model(make_products_ab, storage_days):
+    products = make_products_ab()
+    products[1].storage_days = storage_days
+    om = OptModel(products, "pulp", inventory_weight=0.01)
+    ac, xs = om.evaluate()
+    mm = MatrixModel(products, inventory_weight=0.01)
+    ac2, xs2 = mm.evaluate()
+    assert mm.objective_value == pytest.approx(om.model.objective.value())
+    assert ac2 == ac
+    for p in xs:
+        assert xs2[p] == pytest.approx(xs[p])
+
+
+def test_matrix_shape(make_products_ab):
+    mm = MatrixModel(make_products_ab(), inventory_weight=0)
+    lp = mm.build()
+    # 2 products * 4 days for production, inventory and cumulative
+    # requirement, 7 orders
+    assert lp.shape == (3 * 2 * 4, 3 * 2 * 4 + 7)
+
+
+def test_matrix_model_report(make_products_ab, caplog, capsys):
+    import logging
+
+    mm = MatrixModel(make_products_ab(), inventory_weight=0)
+    mm.evaluate()
+    assert capsys.readouterr().out == ""
+    mm.use_logging = True
+    with caplog.at_level(logging.INFO, logger="aloh"):
+        mm.evaluate()
+    assert any(r.getMessage().startswith("Solved in") for r in caplog.records)
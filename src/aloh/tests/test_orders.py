@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from aloh import OptModel, Product
+from aloh.interface import Order
+from aloh.orders import Orders, load_orders, read_orders
+
+
+def order_table():
+    return pd.DataFrame(
+        dict(
+            product=["A", "B", "A", "A", "B"],
+            day=[0, 1, 1, 2, 2],
+            volume=[5, 4, 8, 6, 3],
+            price=[0.5, 1.2, 0.3, 0.4, 1.0],
+        )
+    )
+
+
+def products_without_orders():
+    pa = Product(name="A", capacity=8, unit_cost=0.1)
+    pb = Product(name="B", capacity=5, unit_cost=0.6)
+    return [pa, pb]
+
+
+def make_products_one_by_one():
+    ps = products_without_orders()
+    ix = {p.name: p for p in ps}
+    for row in order_table().itertuples():
+        ix[row.product].add_order(row.day, row.volume, row.price)
+    return ps
+
+
+def test_orders_iterate_as_order_objects():
+    orders = Orders([0, 2], [5, 6], [0.5, 0.4])
+    assert len(orders) == 2
+    assert list(orders) == [Order(0, 5, 0.5), Order(2, 6, 0.4)]
+    assert orders == [dict(day=0, volume=5, price=0.5), Order(2, 6, 0.4)]
+
+
+def test_read_orders_keeps_row_order_within_product():
+    orders = read_orders(order_table())
+    assert list(orders) == ["A", "B"]
+    assert orders["A"].day.tolist() == [0, 1, 2]
+    assert orders["A"].volume.tolist() == [5, 8, 6]
+    assert orders["B"].price.tolist() == [1.2, 1.0]
+
+
+def test_read_orders_from_structured_array_and_csv(tmp_path):
+    df = order_table()
+    expected = read_orders(df)
+    path = tmp_path / "orders.csv"
+    df.to_csv(path, index=False)
+    assert read_orders(path) == expected
+    assert read_orders(df.to_records(index=False)) == expected
+
+
+def test_read_orders_rejects_unknown_source(tmp_path):
+    with pytest.raises(ValueError):
+        read_orders(tmp_path / "orders.txt")
+    with pytest.raises(TypeError):
+        read_orders([1, 2, 3])
+
+
+def test_load_orders_rejects_unknown_product():
+    with pytest.raises(ValueError, match="C"):
+        load_orders(products_without_orders()[:1], order_table().replace("B", "C"))
+
+
+def test_add_order_after_load():
+    ps = load_orders(products_without_orders(), order_table())
+    ps[1].add_order(day=3, volume=1, price=2)
+    assert isinstance(ps[1].orders, Orders)
+    assert ps[1].orders.day.tolist() == [1, 2, 3]
+
+
+def test_bulk_loaded_model_same_as_one_by_one():
+    m1 = OptModel(make_products_one_by_one(), "one_by_one", inventory_weight=0.05)
+    m2 = OptModel(
+        load_orders(products_without_orders(), order_table()),
+        "bulk",
+        inventory_weight=0.05,
+    )
+    for m in (m1, m2):
+        m.use_solver(msg=False)
+        m.evaluate()
+    assert m1.accepted_orders() == m2.accepted_orders()
+    assert m1.estimated_production() == m2.estimated_production()
+    assert m1.solve_info["objective"] == pytest.approx(m2.solve_info["objective"])
+
+
+def test_orders_are_typed_arrays():
+    orders = Orders([0, 2], [5, 6], [0.5, 0.4])
+    assert orders.day.dtype == np.int32
+    assert orders.volume.dtype == orders.price.dtype == np.float64
+
+
+def test_order_view_writes_to_arrays():
+    orders = Orders([0, 2], [5, 6], [0.5, 0.4])
+    orders[0].price = 0.7
+    orders[-1]["volume"] = 9
+    assert orders.price.tolist() == [0.7, 0.4]
+    assert orders.volume.tolist() == [5, 9]
+    assert orders[1] == dict(day=2, volume=9, price=0.4)
+    with pytest.raises(IndexError):
+        orders[2]
+
+
+def test_append_grows_capacity_and_delete_shifts():
+    orders = Orders()
+    for i in range(10):
+        orders.append(i, i, 1)
+    assert len(orders) == 10
+    assert orders.capacity == 16
+    del orders[0]
+    assert orders.day.tolist() == list(range(1, 10))
+
+
+@pytest.mark.parametrize("day", [1.5, -1, float("nan")])
+def test_orders_reject_invalid_days(day):
+    with pytest.raises(ValueError, match="non-negative integer"):
+        Orders([0, day], [1, 1], [1, 1])
+    orders = Orders([0], [1], [1])
+    with pytest.raises(ValueError, match="non-negative integer"):
+        orders.append(day, 1, 1)
+    assert len(orders) == 1
+    assert Orders([0.0, 2.0], [1, 1], [1, 1]).day.tolist() == [0, 2]
+
+
+def test_product_orders_default_to_array_store():
+    p = Product("A")
+    p.add_order(day=1, volume=2, price=0.5)
+    assert isinstance(p.orders, Orders)
+    assert p == Product("A", orders=[dict(day=1, volume=2, price=0.5)])
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from aloh import OptModel, Product
+from aloh.prescreen import prescreen
+
+
+def rule_products():
+    pa = Product(name="A", capacity=10, unit_cost=0.2)
+    pa.add_order(day=0, volume=7, price=0.3)
+    # below full cost 0.2 + 0.5 * 0.1
+    pa.add_order(day=0, volume=3, price=0.24)
+    # over capacity of A for days 0 and 1
+    pa.add_order(day=1, volume=21, price=0.9)
+    pa.add_order(day=2, volume=6, price=0.3)
+    pa.requires = dict(B=0.5)
+    pb = Product(name="B", capacity=10, unit_cost=0.1)
+    pb.add_order(day=1, volume=4, price=0.2)
+    pb.add_order(day=2, volume=9, price=0.3)
+    return [pa, pb]
+
+
+def model(products):
+    m = OptModel(products, "prescreen", inventory_weight=0.01)
+    m.use_solver(msg=False)
+    return m
+
+
+def test_prescreen_rules():
+    m = model(rule_products())
+    report = prescreen(m, lp=False)
+    assert report.fixed == {"A": {1: 0, 2: 0}}
+    assert report.below_cost == 1
+    assert report.over_capacity == 1
+    assert report.as_dict()["remaining"] == 4
+    assert m.timer.as_dict()["prescreen"]["count"] == 2
+
+
+def random_products(n_orders: int):
+    random.seed(0)
+    pa = Product(name="A", capacity=20, unit_cost=0.2, requires=dict(B=0.5))
+    pb = Product(name="B", capacity=15, unit_cost=0.1)
+    for p in (pa, pb):
+        for _ in range(n_orders):
+            p.add_order(
+                day=random.randrange(10),
+                volume=random.randint(1, 10),
+                price=round(random.uniform(0.1, 0.6), 2),
+            )
+    return [pa, pb]
+
+
+def test_prescreen_keeps_optimum():
+    m1 = model(random_products(40))
+    m1.evaluate()
+    m2 = model(random_products(40))
+    report = prescreen(m2)
+    m2.evaluate()
+    assert report.eliminated > 0
+    assert m2.solve_info["objective"] == pytest.approx(m1.solve_info["objective"])
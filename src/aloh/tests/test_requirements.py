@@ -1,6 +1,7 @@
 import numpy as np
 
-from aloh.requirements import Materials
+from aloh.requirements import (Materials, calculate_full_requirement,
+                               topological_order)
 
 ms = Materials(["A", "B", "C"])
 ms.require("A", 0.8, "B")
@@ -56,6 +57,62 @@ def test_ABC():
     }
 
 
+def test_R_is_recalculated_after_require():
+    ms = Materials(["A", "B"])
+    assert ms.calculate_R()[0, 1] == 0
+    ms.require("A", 2, "B")
+    assert ms.calculate_R()[0, 1] == 2
+
+
+def test_full_requirements_skip_zeros():
+    assert ms.full_requirements() == {
+        "A": {"A": 1.0, "B": 0.8, "C": 1.4},
+        "B": {"B": 1.0, "C": 0.5},
+        "C": {"C": 1.0},
+    }
+
+
+def test_acyclic_R_matches_dense_inverse():
+    ms = Materials(["car", "wheel", "body", "metal", "rubber"])
+    ms.require("car", 4, "wheel")
+    ms.require("car", 1, "body")
+    ms.require("wheel", 10, "metal")
+    ms.require("body", 50, "rubber")
+    assert ms.is_acyclic()
+    B = ms.B.to_numpy()
+    assert np.allclose(ms.calculate_R(), calculate_full_requirement(B))
+
+
+def test_cyclic_R_falls_back_to_dense_inverse():
+    ms = Materials(["A", "B"])
+    ms.require("A", 0.5, "B")
+    ms.require("B", 0.5, "A")
+    assert not ms.is_acyclic()
+    assert np.allclose(ms.calculate_R(), [[4 / 3, 2 / 3], [2 / 3, 4 / 3]])
+
+
+def test_topological_order():
+    assert topological_order({"A": {"B": 1}, "B": {"C": 1}, "C": {}}) == [
+        "C",
+        "B",
+        "A",
+    ]
+    assert topological_order({"A": {"A": 0.1}}) is None
+
+
+def test_set_B():
+    ms = Materials(["A", "B", "C"])
+    ms.require("A", 0.8, "B")
+    ms.calculate_R()
+    B = ms.B
+    B.loc["B", "C"] = 0.5
+    ms.B = B
+    assert ms.requires == {"A": {"B": 0.8}, "B": {"C": 0.5}, "C": {}}
+    assert ms.full_requirements()["A"] == {"A": 1.0, "B": 0.8, "C": 0.4}
+    ms.B = np.zeros((3, 3))
+    assert ms.requires == {"A": {}, "B": {}, "C": {}}
+
+
 if __name__ == "__main__":
     import pytest
 
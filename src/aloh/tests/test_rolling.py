@@ -0,0 +1,70 @@
+import pytest
+
+from aloh import OptModel
+from aloh.rolling import RollingHorizon, window_products
+
+
+@pytest.fixture
+def products(make_products):
+    ps = make_products()
+    ps[0].add_order(day=4, volume=8, price=0.4)
+    ps[0].add_order(day=5, volume=12, price=0.4)
+    return ps
+
+
+def full_model(products):
+    m = OptModel(products, model_name="full", inventory_weight=0.01)
+    m.use_solver(msg=False)
+    m.evaluate()
+    return m
+
+
+def test_window_products(products):
+    ps, positions = window_products(products, 2, 5)
+    assert ps[0].orders == [
+        dict(day=0, volume=6, price=0.3),
+        dict(day=0, volume=6, price=0.3),
+        dict(day=2, volume=8, price=0.4),
+    ]
+    assert positions == {"A": [3, 4, 5]}
+
+
+def test_single_window_is_full_model(products):
+    m = full_model(products)
+    r = RollingHorizon(products, "rolling", 0.01, window=10, step=3)
+    ac, xs = r.evaluate()
+    assert ac == m.accepted_orders()
+    assert xs == m.estimated_production()
+    assert r.objective_value() == pytest.approx(m.model.objective.value())
+
+
+@pytest.mark.parametrize("window, step", [(3, 1), (3, 2), (4, 2)])
+def test_rolling_horizon(products, window, step):
+    r = RollingHorizon(products, "rolling", 0.01, window, step)
+    ac, xs = r.evaluate()
+    assert len(xs["A"]) == 6
+    assert all(0 <= x <= 10 for x in xs["A"])
+    assert r.objective_value() <= full_model(products).model.objective.value() + 1e-6
+    assert sum(w["fixed"] for w in r.windows) == 6
+
+
+def test_step_larger_than_window(products):
+    with pytest.raises(ValueError):
+        RollingHorizon(products, "rolling", 0, window=2, step=3)
+
+
+@pytest.mark.parametrize("window, step", [(3, 1), (3, 3)])
+def test_rolling_inventory_is_carried_over(products, window, step):
+    r = RollingHorizon(products, "rolling", 0.01, window, step)
+    ac, xs = r.evaluate()
+    orders = r.orders["A"]
+    stock = 0
+    for d in range(6):
+        shipped = sum(
+            v for a, v, x in zip(ac["A"], orders.volume, orders.day) if a and x == d
+        )
+        stock += xs["A"][d] - shipped
+        assert stock == pytest.approx(r.inv["A"][d], abs=1e-6)
+    assert r.inv["A"][-1] == pytest.approx(0, abs=1e-6)
+    if step == window:
+        assert r.inv["A"][window - 1] == pytest.approx(0, abs=1e-6)
@@ -0,0 +1,45 @@
+import pytest
+
+from aloh import Product
+from aloh.scenarios import (Scenario, run_scenarios, scenario_grid,
+                            worker_threads)
+
+pa = Product(name="A", capacity=10, unit_cost=0.2, storage_days=1)
+pa.add_order(day=0, volume=7, price=0.3)
+pa.add_order(day=0, volume=7, price=0.5)
+pa.add_order(day=1, volume=9, price=0.1)
+pa.add_order(day=2, volume=6, price=0.3)
+pa.add_order(day=2, volume=6, price=0.3)
+
+
+def test_scenario_grid():
+    assert scenario_grid([0, 0.1], [{}, {"A": 15}]) == [
+        Scenario(0, {}),
+        Scenario(0, {"A": 15}),
+        Scenario(0.1, {}),
+        Scenario(0.1, {"A": 15}),
+    ]
+
+
+def test_worker_threads():
+    assert worker_threads(4, None, n_cores=8) == 2
+    assert worker_threads(16, None, n_cores=8) == 1
+    with pytest.raises(ValueError):
+        worker_threads(4, 4, n_cores=8)
+
+
+def test_run_scenarios():
+    scenarios = scenario_grid([0], [{}, {"A": 14}])
+    df = run_scenarios([pa], scenarios, max_workers=2)
+    accept = df[df.variable == "accept"].pivot(
+        index="n", columns="scenario", values="value"
+    )
+    assert accept[0].tolist() == [0, 1, 0, 1, 1]
+    assert accept[1].tolist() == [1, 1, 0, 1, 1]
+    assert df.groupby("scenario").capacity.first().tolist() == [10, 14]
+    assert pa.capacity == 10
+
+
+def test_run_no_scenarios():
+    with pytest.raises(ValueError):
+        run_scenarios([Product("A", capacity=10)], [])
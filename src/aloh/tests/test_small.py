@@ -1,5 +1,7 @@
-from aloh.interface import Product
-from aloh.small import DataframeViewer, OptModel
+import pytest
+
+from aloh.interface import Order, Product
+from aloh.small import DataframeViewer, Dim, OptModel, make_accept_dict
 
 pa = Product("A")
 pa.capacity = 100
@@ -98,6 +100,144 @@ def test_accepted_orders_full():
     }
 
 
+def test_inventory_formulations_have_same_optimum():
+    objectives = []
+    for inventory in ["balance", "cumulative"]:
+        om = OptModel([pa, pb], "tiny_model", inventory_weight=0.1, inventory=inventory)
+        om.evaluate()
+        objectives.append(om.model.objective.value())
+    assert objectives[0] == pytest.approx(objectives[1])
+
+
+def test_storage_limit_size_does_not_depend_on_storage_days():
+    sizes = []
+    for storage_days in [2, 20]:
+        p = Product("A", capacity=10, unit_cost=0.1, storage_days=storage_days)
+        for d in range(40):
+            p.add_order(day=d, volume=5, price=0.5)
+        om = OptModel([p], "storage", inventory_weight=0.1)
+        om.set_storage_limit()
+        constraints = om.model.constraints
+        sizes.append([len(c) for k, c in constraints.items() if "Storage" in k])
+    assert sizes[0] == sizes[1]
+    assert max(sizes[0]) <= 3
+
+
+def test_storage_limit_follows_requirements():
+    # B has no orders of its own, but can be stored for a day before use in A
+    pa = Product("A", capacity=10, unit_cost=0.1, requires=dict(B=1))
+    pa.add_order(day=1, volume=10, price=1)
+    pb = Product("B", capacity=5, unit_cost=0.1, storage_days=1)
+    om = OptModel([pa, pb], "storage", inventory_weight=0.01)
+    om.use_solver(msg=False)
+    ac, xs = om.evaluate()
+    assert ac["A"] == [1]
+    assert xs["B"] == [5, 5]
+
+
+def test_make_shipment_sales_rejects_order_outside_days():
+    order_dict = {
+        "A": [Order(day=0, volume=1, price=1), Order(day=3, volume=1, price=1)]
+    }
+    dim = Dim(["A"], [0, 1, 2])
+    with pytest.raises(ValueError, match="day 3"):
+        dim.make_shipment_sales(order_dict, make_accept_dict(order_dict))
+
+
+def test_solution_arrays_are_evaluated_once(monkeypatch):
+    import aloh.small
+
+    calls = []
+    f = aloh.small.solution_arrays
+    monkeypatch.setattr(
+        aloh.small, "solution_arrays", lambda m: calls.append(1) or f(m)
+    )
+    v = DataframeViewer(m)
+    v.product_dataframes()
+    v.summary_dataframe()
+    assert len(calls) == 1
+    assert v.arrays()["prod"].shape == (2, 3)
+
+
+def test_orders_table():
+    df = dv.orders_table()
+    assert df.columns.tolist() == ["product", "n", "day", "volume", "price", "accept"]
+    assert df.accept.tolist() == [1, 0, 1, 0, 0, 1, 1]
+    assert dv.orders_dataframe("B").to_dict() == {
+        "day": {0: 0, 1: 2, 2: 2},
+        "volume": {0: 100, 1: 150, 2: 150},
+        "price": {0: 0.3, 1: 0.7, 2: 0.8},
+        "accept": {0: 0, 1: 1, 2: 1},
+    }
+    assert dv.orders_summary().to_dict() == {
+        "A": {0: 55, 1: 110, 2: 110},
+        "B": {0: 100, 1: 0, 2: 300},
+    }
+
+
+def test_timings():
+    phases = m.timer.as_dict()
+    assert list(phases) == [
+        "variables",
+        "shipment_sales",
+        "requirements",
+        "inventory",
+        "objective",
+        "set_inventory_balance",
+        "set_non_negative_inventory",
+        "set_closed_sum",
+        "set_storage_limit",
+        "solver",
+        "result_extraction",
+    ]
+    # 2 products * 3 days of production and 7 orders
+    assert phases["variables"]["count"] == 13
+    assert phases["set_closed_sum"]["count"] == 2
+    assert m.timings().seconds.sum() == pytest.approx(m.timer.total)
+
+
+def test_expressions_are_created_on_first_access():
+    m = OptModel([pa, pb], "lazy_model", inventory_weight=0.1)
+    assert m.n_days == 3
+    assert "prod" not in m.__dict__
+    assert len(m.req["A"]) == 3
+    assert list(m.timer.as_dict()) == ["variables", "shipment_sales", "requirements"]
+    assert "inv" not in m.__dict__
+    with pytest.raises(AttributeError):
+        m.no_such_attribute
+
+
+def test_lazy_phases_do_not_nest(monkeypatch):
+    import time
+
+    m = OptModel([pa, pb], "lazy_model", inventory_weight=0.1)
+    make_shipment_sales = m.dim.make_shipment_sales
+
+    def slow(*args):
+        time.sleep(0.05)
+        return make_shipment_sales(*args)
+
+    monkeypatch.setattr(m.dim, "make_shipment_sales", slow)
+    m.req
+    phases = m.timer.as_dict()
+    assert phases["shipment_sales"]["seconds"] >= 0.05
+    assert phases["requirements"]["seconds"] < 0.05
+
+
+def test_use_logging(caplog, capsys):
+    import logging
+
+    om = OptModel([pa, pb], "tiny_model", inventory_weight=0.1)
+    om.use_solver(msg=False)
+    om.use_logging = True
+    with caplog.at_level(logging.DEBUG, logger="aloh"):
+        om.evaluate()
+    assert "Solved in" not in capsys.readouterr().out
+    messages = [r.getMessage() for r in caplog.records]
+    assert any(x.startswith("Solved in") for x in messages)
+    assert any(x.startswith("set_storage_limit") for x in messages)
+
+
 if __name__ == "__main__":
     import pytest
 
@@ -0,0 +1,43 @@
+import pytest
+
+from aloh import OptModel
+from aloh.solvers import SolverSettings, available
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "CBC",
+        pytest.param(
+            "HiGHS",
+            marks=pytest.mark.skipif(
+                not available("HiGHS"), reason="HiGHS is not installed"
+            ),
+        ),
+    ],
+)
+def test_solvers_give_same_result(make_products, name):
+    m = OptModel(make_products(), model_name="model_0", inventory_weight=0)
+    m.use_solver(name, threads=1, time_limit=10, gap=0, presolve=True, msg=False)
+    ac, xs = m.evaluate()
+    assert ac == {"A": [0, 1, 0, 1, 1]}
+    assert xs["A"] == pytest.approx([7, 2, 10])
+    assert m.solve_info["status"] == "Optimal"
+    assert m.solve_info["solver"] == dict(
+        name=name,
+        threads=1,
+        time_limit=10,
+        gap=0,
+        presolve=True,
+        msg=False,
+        warm_start=False,
+    )
+
+
+def test_solver_name_is_case_insensitive():
+    assert SolverSettings("highs").name == "HiGHS"
+
+
+def test_unknown_solver():
+    with pytest.raises(ValueError):
+        SolverSettings("gurobi")
@@ -0,0 +1,62 @@
+"""Wall time and object counts for model build and solve phases.
+
+Phases are also reported as DEBUG records of the "aloh" logger.
+"""
+
+import logging
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from time import perf_counter
+from typing import Dict, List
+
+__all__ = ["Phase", "Timer", "logger"]
+
+logger = logging.getLogger("aloh")
+
+
+@dataclass
+class Phase:
+    """Phase name, wall time and number of objects (variables,
+    expression terms or constraints) created in the phase.
+    """
+
+    name: str
+    seconds: float = 0
+    count: int = 0
+
+
+class Timer:
+    def __init__(self):
+        self.phases: List[Phase] = []
+
+    @contextmanager
+    def phase(self, name: str):
+        """Record wall time of code within the context.
+        Set *count* of the yielded phase to record number of objects.
+        """
+        ph = Phase(name)
+        start = perf_counter()
+        try:
+            yield ph
+        finally:
+            ph.seconds = perf_counter() - start
+            self.phases.append(ph)
+            logger.debug("%s: %.4f sec, %d objects", ph.name, ph.seconds, ph.count)
+
+    @property
+    def total(self) -> float:
+        return sum(ph.seconds for ph in self.phases)
+
+    def as_dict(self) -> Dict[str, Dict]:
+        """Seconds and counts by phase name, repeated phases are summed."""
+        res: Dict[str, Dict] = {}
+        for ph in self.phases:
+            x = res.setdefault(ph.name, dict(seconds=0, count=0))
+            x["seconds"] += ph.seconds
+            x["count"] += ph.count
+        return res
+
+    def dataframe(self):
+        import pandas as pd
+
+        return pd.DataFrame([asdict(ph) for ph in self.phases])